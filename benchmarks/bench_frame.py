@@ -0,0 +1,49 @@
+# benchmarks/bench_frame.py
+# Đo toàn bộ vòng lặp game (update + draw) ở chế độ headless, không cần camera.
+# Chạy từ thư mục gốc: python benchmarks/bench_frame.py --frames 2000
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # Ảnh nền + font được load theo đường dẫn tương đối
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from settings import WIDTH, HEIGHT
+from core import FakeLandmarkSource, TraceReplaySource
+from main import ShadowGame
+
+
+def report(frame_times, warmup):
+    times = np.array(frame_times[warmup:]) * 1000.0
+    p50, p95, p99 = np.percentile(times, [50, 95, 99])
+    print(f"Khung đo: {len(times)} (bỏ {warmup} khung khởi động)")
+    print(f"FPS: {1000.0 / times.mean():.1f}")
+    print(f"ms/khung  tb: {times.mean():.3f}  p50: {p50:.3f}  p95: {p95:.3f}  "
+          f"p99: {p99:.3f}  max: {times.max():.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vòng lặp game headless")
+    parser.add_argument("--frames", type=int, default=1000, help="Số khung cần đo")
+    parser.add_argument("--warmup", type=int, default=60, help="Số khung khởi động không tính")
+    parser.add_argument("--hands", type=int, default=2, help="Số bàn tay giả")
+    parser.add_argument("--trace", metavar="FILE", help="Phát lại file trace thay cho tay giả")
+    parser.add_argument("--party", action="store_true", help="Chế độ tiệc (hàng trăm bóng)")
+    args = parser.parse_args()
+
+    if args.trace:
+        source = TraceReplaySource(args.trace, realtime=False)
+    else:
+        source = FakeLandmarkSource(WIDTH, HEIGHT, num_hands=args.hands)
+    game = ShadowGame(headless=True, hand_source=source, party=args.party)
+    frame_times = game.run_headless(args.frames + args.warmup)
+    report(frame_times, args.warmup)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_hand_shapes.py
+# So sánh số shape tay được cấp phát mỗi khung: tạo lại toàn bộ (cách cũ)
+# và cập nhật tại chỗ (PhysicsManager hiện tại).
+# Chạy từ thư mục gốc: python benchmarks/bench_hand_shapes.py
+
+import os
+import sys
+import time
+
+import numpy as np
+import pymunk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from settings import FINGER_THICKNESS, FPS
+from core.hand_data import HandModel
+from core.physics_manager import PhysicsManager
+
+FRAMES = 600
+NUM_HANDS = 2
+
+
+def make_hands(num_frames, num_hands, seed=0):
+    """Tạo chuỗi landmarks giả: bàn tay đung đưa trên màn hình"""
+    rng = np.random.default_rng(seed)
+    base = rng.random((num_hands, 21, 2)).astype(np.float32) * 200
+    t = np.arange(num_frames, dtype=np.float32) / FPS
+    offset = np.stack([400 + 200 * np.sin(t * 2), 300 + 100 * np.cos(t * 3)], axis=-1)
+    spacing = np.arange(num_hands, dtype=np.float32)[:, None, None] * (300, 0)
+    return (base[None] + spacing[None] + offset[:, None, None, :]).astype(np.float32)
+
+def rebuild_hand_shapes(physics, hands, shapes):
+    """Cách cũ: gỡ toàn bộ shape rồi cấp phát lại mỗi khung"""
+    for shape in shapes:
+        physics.space.remove(shape)
+    shapes.clear()
+
+    created = 0
+    for hand in hands:
+        palm = hand[HandModel.PALM_INDICES_ARRAY].tolist()
+        poly = pymunk.Poly(physics.hand_body, palm)
+        poly.filter = pymunk.ShapeFilter(group=1)
+        physics.space.add(poly)
+        shapes.append(poly)
+        created += 1
+        for p1_id, p2_id in HandModel.CONNECTIONS:
+            seg = pymunk.Segment(physics.hand_body, hand[p1_id].tolist(), hand[p2_id].tolist(),
+                                 FINGER_THICKNESS / 2.0)
+            seg.filter = pymunk.ShapeFilter(group=1)
+            physics.space.add(seg)
+            shapes.append(seg)
+            created += 1
+    return created
+
+
+def run(frames_data):
+    dt = 1 / FPS
+
+    # --- Cách cũ ---
+    physics = PhysicsManager()
+    shapes = []
+    created = 0
+    start = time.perf_counter()
+    for hands in frames_data:
+        created += rebuild_hand_shapes(physics, hands, shapes)
+        physics.space.step(dt)
+    old_time = time.perf_counter() - start
+    old_created = created
+
+    # --- Cập nhật tại chỗ ---
+    physics = PhysicsManager()
+    start = time.perf_counter()
+    for hands in frames_data:
+        physics.update_hand_physics(hands)
+        physics.space.step(dt)
+    new_time = time.perf_counter() - start
+    new_created = physics.hand_shapes_created
+
+    n = len(frames_data)
+    print(f"Khung: {n} | Số tay: {frames_data.shape[1]} | Shape sống: {len(physics.hand_shapes)}")
+    print(f"{'Chế độ':<16}{'shape tạo':>12}{'shape/khung':>14}{'ms/khung':>12}")
+    print(f"{'tạo lại':<16}{old_created:>12}{old_created / n:>14.2f}{old_time / n * 1000:>12.3f}")
+    print(f"{'tại chỗ':<16}{new_created:>12}{new_created / n:>14.2f}{new_time / n * 1000:>12.3f}")
+
+
+if __name__ == "__main__":
+    run(make_hands(FRAMES, NUM_HANDS))
@@ -0,0 +1,93 @@
+# benchmarks/bench_hand_tracking.py
+# So sánh chi phí nhận diện tay giữa các preset (VD 'kiosk-lowend' với 'quality')
+# trên CÙNG một chuỗi khung hình: thời gian mỗi khung, số tay tìm được và độ lệch
+# landmarks so với preset tham chiếu.
+# Chạy từ thư mục gốc:
+#   python benchmarks/bench_hand_tracking.py --video tay.mp4
+#   python benchmarks/bench_hand_tracking.py --camera 0 --frames 300
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from settings import WIDTH, HEIGHT, HAND_TRACKING_PRESETS
+from core.hand_tracking import HandTracker
+
+REFERENCE_PRESET = 'quality'
+
+
+def load_frames(args):
+    """Đọc trước toàn bộ khung (đã lật như trong game) để mọi preset chạy cùng dữ liệu"""
+    cap = cv2.VideoCapture(args.video if args.video else args.camera)
+    if not args.video:
+        cap.set(3, WIDTH)
+        cap.set(4, HEIGHT)
+    frames = []
+    while len(frames) < args.frames:
+        success, frame = cap.read()
+        if not success:
+            break
+        frames.append(cv2.flip(frame, 1))
+    cap.release()
+    return frames
+
+
+def run_preset(preset, frames, max_hands):
+    """Chạy HandTracker một preset trên các khung -> (thời gian từng khung, landmarks, số tay)"""
+    tracker = HandTracker(max_hands=max_hands, preset=preset)
+    times = np.zeros(len(frames))
+    landmarks = np.zeros((len(frames), max_hands, 21, 2), dtype=np.float32)
+    counts = np.zeros(len(frames), dtype=np.int32)
+    for i, frame in enumerate(frames):
+        start = time.perf_counter()
+        tracker.process(frame)
+        times[i] = time.perf_counter() - start
+        counts[i] = tracker.num_hands
+        landmarks[i, :tracker.num_hands] = tracker.landmarks[:tracker.num_hands]
+    return times, landmarks, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark các preset nhận diện tay")
+    parser.add_argument('--video', default=None, help="File video (mặc định: webcam)")
+    parser.add_argument('--camera', type=int, default=0)
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--max-hands', type=int, default=2)
+    parser.add_argument('--presets', nargs='+', default=list(HAND_TRACKING_PRESETS))
+    args = parser.parse_args()
+
+    frames = load_frames(args)
+    if not frames:
+        print("❌ Không đọc được khung hình nào")
+        return
+    print(f"Khung: {len(frames)} | {frames[0].shape[1]}x{frames[0].shape[0]}")
+
+    presets = [REFERENCE_PRESET] + [p for p in args.presets if p != REFERENCE_PRESET]
+    reference = None
+    for preset in presets:
+        times, landmarks, counts = run_preset(preset, frames, args.max_hands)
+        ms = times * 1000.0
+        line = (f"{preset:>14}: TB {ms.mean():6.2f} ms | p50 {np.percentile(ms, 50):6.2f} | "
+                f"p95 {np.percentile(ms, 95):6.2f} | có tay {np.mean(counts > 0) * 100:5.1f}%")
+
+        if reference is None:
+            reference = (landmarks, counts)
+        else:
+            # Độ lệch cổ tay (pixel) ở các khung cả hai preset cùng thấy một tay
+            ref_landmarks, ref_counts = reference
+            both = (counts > 0) & (ref_counts > 0)
+            if both.any():
+                diff = (landmarks[both, 0, 0] - ref_landmarks[both, 0, 0]) * (WIDTH, HEIGHT)
+                line += f" | lệch cổ tay {np.median(np.linalg.norm(diff, axis=1)):5.1f} px"
+            line += f" | mất tay {np.mean((ref_counts > 0) & (counts == 0)) * 100:4.1f}%"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
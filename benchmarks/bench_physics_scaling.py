@@ -0,0 +1,71 @@
+# benchmarks/bench_physics_scaling.py
+# Đo thời gian một bước vật lý theo số bóng trên sân (chế độ tiệc):
+# cây BB mặc định / spatial hash / spatial hash + bộ giải đa luồng.
+# Chạy từ thư mục gốc: python benchmarks/bench_physics_scaling.py --counts 50 100 200 400
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from settings import WIDTH, HEIGHT, FPS, BALL_RADIUS
+from core.physics_manager import PhysicsManager
+
+
+def fill_balls(physics, count):
+    """Thêm bóng ở nửa trên màn hình cho đủ `count` (bóng rơi ra ngoài được bù lại)"""
+    while len(physics.balls) < count:
+        physics._create_ball_now(random.randint(100, WIDTH - 100), 'normal', None)
+        ball = physics.balls[-1]
+        ball.body.position = (random.uniform(BALL_RADIUS, WIDTH - BALL_RADIUS),
+                              random.uniform(BALL_RADIUS, HEIGHT / 2))
+
+
+def measure(count, frames, warmup, party_mode, threads):
+    random.seed(0)
+    physics = PhysicsManager(party_mode=party_mode, threads=threads)
+    dt = physics.fixed_dt
+    times = []
+    for frame in range(warmup + frames):
+        fill_balls(physics, count)
+        physics.pop_ball_events()
+        start = time.perf_counter()
+        physics.step(dt)
+        if frame >= warmup:
+            times.append(time.perf_counter() - start)
+    times = np.array(times) * 1000.0
+    return times.mean(), np.percentile(times, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vật lý theo số bóng")
+    parser.add_argument("--counts", type=int, nargs="+", default=[25, 50, 100, 200, 400, 800])
+    parser.add_argument("--frames", type=int, default=300, help="Số bước đo cho mỗi cấu hình")
+    parser.add_argument("--warmup", type=int, default=60, help="Số bước khởi động không tính")
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 1,
+                        help="Số luồng cho bộ giải đa luồng")
+    args = parser.parse_args()
+
+    configs = [
+        ("cây BB", False, 1),
+        ("spatial hash", True, 1),
+        (f"hash + {args.threads} luồng", True, args.threads),
+    ]
+    budget = 1000.0 / FPS
+    print(f"ms/bước (tb / p95) - ngân sách một khung {FPS} FPS: {budget:.1f} ms")
+    print(f"{'số bóng':>8}" + "".join(f"{name:>24}" for name, _, _ in configs))
+    for count in args.counts:
+        row = f"{count:>8}"
+        for _, party_mode, threads in configs:
+            mean, p95 = measure(count, args.frames, args.warmup, party_mode, threads)
+            row += f"{mean:>14.3f} / {p95:>7.3f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,4 +7,15 @@ from .renderer import GameRenderer
 from .combo_system import ComboSystem
 from .powerup_system import PowerUpSystem
 from .particle_system import ParticleSystem
-from .tutorial_system import TutorialSystem
\ No newline at end of file
+from .tutorial_system import TutorialSystem
+from .capture_worker import CaptureWorker
+from .inference_process import ProcessHandSource
+from .landmark_predictor import LandmarkPredictor
+from .landmark_filter import OneEuroFilter
+from .fake_source import FakeLandmarkSource
+from .landmark_trace import LandmarkRecorder, TraceReplaySource
+from .frame_profiler import FrameProfiler
+from .text_cache import TextCache
+from .game_clock import GameClock
+from .event_scheduler import EventScheduler
+from .multi_source import MultiCameraSource, split_regions
\ No newline at end of file
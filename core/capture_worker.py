@@ -0,0 +1,120 @@
+# core/capture_worker.py
+import threading
+import time
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+# Kết quả mới nhất mà worker công bố cho vòng lặp game
+# - hands: mảng (n_hands, 21, 2) float32 tọa độ pixel
+# - timestamp: thời điểm chụp khung (time.perf_counter(), giây)
+LandmarkResult = namedtuple('LandmarkResult', ['frame_id', 'timestamp', 'hands'])
+
+EMPTY_RESULT = LandmarkResult(frame_id=-1, timestamp=0.0,
+                              hands=np.zeros((0, NUM_LANDMARKS, 2), dtype=np.float32))
+
+
+class CaptureWorker:
+    """
+    Đọc webcam + chạy HandTracker trên một luồng nền.
+    Vòng lặp game chỉ đọc "kết quả mới nhất" (có khóa), không bao giờ chờ camera.
+    """
+    def __init__(self, tracker, width, height, camera_index=0, profiler=None):
+        self.tracker = tracker
+        self.profiler = profiler
+        self.max_hands = tracker.max_hands
+        self.width = width
+        self.height = height
+        self.camera_index = camera_index
+
+        self.cap = None
+        self._thread = None
+        self._running = False
+
+        # Ô "kết quả mới nhất" được bảo vệ bởi khóa
+        self._lock = threading.Lock()
+        self._latest = EMPTY_RESULT
+        self._consumed = True
+
+        # Hai bộ đệm cố định: worker ghi vào _shared, game copy sang _front
+        self._shared = np.zeros((self.max_hands, NUM_LANDMARKS, 2), dtype=np.float32)
+        self._shared_count = 0
+        self._shared_timestamp = 0.0
+        self._front = np.zeros_like(self._shared)
+
+        # --- BỘ ĐẾM ---
+        self.frames_processed = 0  # Số khung đã nhận diện xong
+        self.dropped_frames = 0    # Kết quả bị ghi đè trước khi game kịp đọc
+        self.stale_frames = 0      # Game đọc lại kết quả cũ (chưa có khung mới)
+        self.read_failures = 0     # cap.read() thất bại
+
+    def start(self):
+        """Mở webcam và chạy luồng nền"""
+        self.cap = cv2.VideoCapture(self.camera_index)
+        self.cap.set(3, self.width)
+        self.cap.set(4, self.height)
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="CaptureWorker", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while self._running:
+            start = time.perf_counter()
+            success, frame = self.cap.read()
+            if not success:
+                self.read_failures += 1
+                time.sleep(0.005)
+                continue
+            timestamp = time.perf_counter()
+
+            frame = cv2.flip(frame, 1)
+            self.tracker.process(frame)
+            hands = self.tracker.get_hand_landmarks_array(self.width, self.height)
+            self._publish(hands, timestamp)
+
+            if self.profiler:
+                self.profiler.add('camera.read', timestamp - start)
+                self.profiler.add('tracker.process', time.perf_counter() - timestamp)
+
+    def _publish(self, hands, timestamp):
+        with self._lock:
+            if not self._consumed:
+                self.dropped_frames += 1
+            self.frames_processed += 1
+            n = len(hands)
+            self._shared[:n] = hands
+            self._shared_count = n
+            self._shared_timestamp = timestamp
+            self._consumed = False
+
+    def get_latest(self):
+        """
+        Lấy kết quả mới nhất - không chặn (non-blocking).
+        Mảng hands trong kết quả được dùng lại ở lần gọi sau.
+        """
+        with self._lock:
+            if self._consumed:
+                self.stale_frames += 1
+                return self._latest
+            n = self._shared_count
+            self._front[:n] = self._shared[:n]
+            self._consumed = True
+            self._latest = LandmarkResult(self.frames_processed, self._shared_timestamp, self._front[:n])
+            return self._latest
+
+    def stop(self):
+        """Dừng luồng nền và giải phóng webcam"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+        print(f"📷 Camera: {self.frames_processed} khung | "
+              f"bỏ qua: {self.dropped_frames} | cũ: {self.stale_frames}")
@@ -1,10 +1,10 @@
 # core/combo_system.py
-import time
 from settings import COMBO_TIMEOUT, COMBO_MULTIPLIERS
 
 class ComboSystem:
     """Quản lý hệ thống combo và streak"""
-    def __init__(self):
+    def __init__(self, clock):
+        self.clock = clock  # GameClock - thời gian game (theo time_scale)
         self.combo_count = 0
         self.last_score_time = 0
         self.current_multiplier = 1
@@ -16,7 +16,7 @@ class ComboSystem:
         
     def add_score(self):
         """Gọi khi ghi điểm"""
-        current_time = time.time()
+        current_time = self.clock.now()
         
         # Kiểm tra timeout
         if self.last_score_time > 0 and (current_time - self.last_score_time) > COMBO_TIMEOUT:
@@ -58,7 +58,7 @@ class ComboSystem:
     def check_timeout(self):
         """Kiểm tra xem combo có bị timeout không"""
         if self.last_score_time > 0:
-            current_time = time.time()
+            current_time = self.clock.now()
             if (current_time - self.last_score_time) > COMBO_TIMEOUT:
                 self.break_combo()
     
@@ -102,7 +102,7 @@ class ComboSystem:
         if self.last_score_time == 0:
             return 0
         
-        current_time = time.time()
+        current_time = self.clock.now()
         elapsed = current_time - self.last_score_time
         remaining = max(0, COMBO_TIMEOUT - elapsed)
         return remaining
\ No newline at end of file
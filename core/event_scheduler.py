@@ -0,0 +1,59 @@
+# core/event_scheduler.py
+import heapq
+
+
+class EventScheduler:
+    """
+    Hàng đợi sự kiện hẹn giờ (heapq) theo GameClock.
+    - Mỗi sự kiện là tuple (thời điểm, số thứ tự, callback, args)
+    - run_due() chỉ lấy ra các sự kiện đã đến hạn -> chi phí không tăng theo số sự kiện đang chờ
+    - cancel(event_id): đánh dấu hủy, bỏ qua khi tới lượt
+    """
+    def __init__(self, clock):
+        self.clock = clock
+        self.heap = []
+        self.seq = 0
+        self.pending = set()     # id các sự kiện chưa chạy
+        self.cancelled = set()   # id đã hủy nhưng còn nằm trong heap
+        self.current_event = None  # id của sự kiện đang chạy callback
+
+    def schedule_at(self, when, callback, *args):
+        """Hẹn callback(*args) chạy tại thời điểm `when` (giây game). Trả về id sự kiện"""
+        self.seq += 1
+        heapq.heappush(self.heap, (when, self.seq, callback, args))
+        self.pending.add(self.seq)
+        return self.seq
+
+    def schedule(self, delay, callback, *args):
+        """Hẹn callback(*args) chạy sau `delay` giây game"""
+        return self.schedule_at(self.clock.now() + delay, callback, *args)
+
+    def cancel(self, event_id):
+        if event_id in self.pending:
+            self.pending.discard(event_id)
+            self.cancelled.add(event_id)
+
+    def run_due(self):
+        """Chạy các sự kiện đã đến hạn (theo thứ tự thời gian). Trả về số sự kiện đã chạy"""
+        now = self.clock.now()
+        heap = self.heap
+        count = 0
+        while heap and heap[0][0] <= now:
+            _, event_id, callback, args = heapq.heappop(heap)
+            if event_id in self.cancelled:
+                self.cancelled.discard(event_id)
+                continue
+            self.pending.discard(event_id)
+            self.current_event = event_id
+            callback(*args)
+            count += 1
+        self.current_event = None
+        return count
+
+    def clear(self):
+        self.heap.clear()
+        self.pending.clear()
+        self.cancelled.clear()
+
+    def __len__(self):
+        return len(self.pending)
@@ -0,0 +1,71 @@
+# core/fake_source.py
+import math
+import time
+
+import numpy as np
+
+from core.capture_worker import LandmarkResult, NUM_LANDMARKS
+
+# Bàn tay mẫu (đơn vị tương đối, cổ tay ở gốc, ngón hướng lên trên)
+_TEMPLATE_HAND = np.array([
+    (0.00, 0.00),                                                   # 0 cổ tay
+    (-0.35, -0.15), (-0.55, -0.35), (-0.70, -0.55), (-0.80, -0.75),  # ngón cái
+    (-0.25, -0.65), (-0.30, -0.95), (-0.33, -1.15), (-0.35, -1.30),  # ngón trỏ
+    (-0.05, -0.70), (-0.05, -1.03), (-0.05, -1.25), (-0.05, -1.42),  # ngón giữa
+    (0.15, -0.65), (0.18, -0.95), (0.20, -1.15), (0.22, -1.30),      # ngón áp út
+    (0.32, -0.55), (0.40, -0.78), (0.45, -0.93), (0.48, -1.05),      # ngón út
+], dtype=np.float32)
+
+
+class FakeLandmarkSource:
+    """
+    Nguồn landmarks giả (không cần camera/MediaPipe) - dùng cho headless/benchmark.
+    Bàn tay vẽ hình số 8 ở nửa dưới màn hình; cứ `frame_interval` lần gọi
+    get_latest() mới có một kết quả mới (giả lập camera 30 FPS khi game chạy 60 FPS).
+    Cùng giao diện với CaptureWorker: start() / get_latest() / stop().
+    time_func: nguồn thời gian cho timestamp (headless thay bằng đồng hồ mô phỏng).
+    """
+    def __init__(self, width, height, num_hands=1, hand_size=180, frame_interval=2,
+                 time_func=time.perf_counter):
+        self.width = width
+        self.height = height
+        self.num_hands = num_hands
+        self.max_hands = num_hands
+        self.hand_size = hand_size
+        self.frame_interval = frame_interval
+        self.time_func = time_func
+
+        self._calls = 0
+        self._buffer = np.zeros((num_hands, NUM_LANDMARKS, 2), dtype=np.float32)
+        self._latest = LandmarkResult(-1, 0.0, self._buffer[:0])
+
+        # --- BỘ ĐẾM (giống CaptureWorker) ---
+        self.frames_processed = 0
+        self.dropped_frames = 0
+        self.stale_frames = 0
+        self.read_failures = 0
+
+    def start(self):
+        pass
+
+    def _generate(self, phase):
+        """Ghi vị trí các bàn tay tại pha `phase` vào bộ đệm"""
+        for h in range(self.num_hands):
+            p = phase + h * math.pi
+            cx = self.width * (0.5 + 0.3 * math.sin(p))
+            cy = self.height * (0.7 + 0.1 * math.sin(2 * p))
+            self._buffer[h] = _TEMPLATE_HAND * self.hand_size + (cx, cy)
+
+    def get_latest(self):
+        self._calls += 1
+        if self._calls % self.frame_interval:
+            self.stale_frames += 1
+            return self._latest
+
+        self.frames_processed += 1
+        self._generate(self.frames_processed * 0.05)
+        self._latest = LandmarkResult(self.frames_processed, self.time_func(), self._buffer)
+        return self._latest
+
+    def stop(self):
+        pass
@@ -0,0 +1,148 @@
+# core/frame_profiler.py
+import csv
+import json
+import time
+from collections import deque
+
+import numpy as np
+import pygame
+
+
+class _NullSpan:
+    """Span rỗng khi profiler tắt - gần như không tốn gì"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class FrameProfiler:
+    """
+    Đo thời gian từng công đoạn của khung hình (camera, vật lý, vẽ, ...).
+    - Dùng: `with profiler.span('physics'): ...`
+    - Giữ cửa sổ trượt `window` mẫu gần nhất cho mỗi công đoạn (trung bình, p50/p95/p99)
+    - Có thể vẽ overlay lên màn hình và xuất CSV/JSON khi thoát
+    An toàn khi gọi add() từ luồng camera.
+    """
+    def __init__(self, enabled=False, window=240):
+        self.enabled = enabled
+        self.window = window
+        # tên công đoạn -> (deque thời gian (giây), [số lần, tổng thời gian])
+        # Một dict duy nhất: luồng camera thêm công đoạn mới bằng một phép gán,
+        # stats() ở luồng chính không bao giờ thấy công đoạn thiếu nửa dữ liệu
+        self.stages = {}
+        self.show_overlay = False
+
+        self._overlay_surface = None
+        self._overlay_age = 0
+        self._font = None
+
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def add(self, name, seconds):
+        """Ghi một mẫu thời gian cho công đoạn `name`"""
+        if not self.enabled:
+            return
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = (deque(maxlen=self.window), [0, 0.0])
+        samples, total = stage
+        samples.append(seconds)
+        total[0] += 1
+        total[1] += seconds
+
+    def stats(self):
+        """Thống kê (ms) theo từng công đoạn trên cửa sổ trượt"""
+        result = {}
+        for name, (samples, totals) in list(self.stages.items()):
+            data = np.array(list(samples)) * 1000.0
+            if len(data) == 0:
+                continue
+            p50, p95, p99 = np.percentile(data, [50, 95, 99])
+            count, total = totals
+            result[name] = {
+                'avg_ms': float(data.mean()),
+                'p50_ms': float(p50),
+                'p95_ms': float(p95),
+                'p99_ms': float(p99),
+                'max_ms': float(data.max()),
+                'count': count,
+                'total_ms': total * 1000.0,
+            }
+        return result
+
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+
+    def draw_overlay(self, screen, refresh_frames=30):
+        """Vẽ bảng thống kê ở góc trái (chỉ dựng lại mỗi `refresh_frames` khung)"""
+        if not (self.enabled and self.show_overlay):
+            return None
+
+        self._overlay_age += 1
+        if self._overlay_surface is None or self._overlay_age >= refresh_frames:
+            self._overlay_age = 0
+            self._overlay_surface = self._build_overlay()
+
+        return screen.blit(self._overlay_surface, (10, 10))
+
+    def _build_overlay(self):
+        # Font đơn cách (monospace) để các cột thẳng hàng
+        if self._font is None:
+            self._font = pygame.font.SysFont("consolas,dejavusansmono,couriernew,monospace", 15)
+        font = self._font
+
+        lines = [f"{'công đoạn':<18}{'tb':>7}{'p95':>7}{'p99':>7}"]
+        for name, st in self.stats().items():
+            lines.append(f"{name:<18}{st['avg_ms']:>7.2f}{st['p95_ms']:>7.2f}{st['p99_ms']:>7.2f}")
+
+        rendered = [font.render(line, True, (255, 255, 255)) for line in lines]
+        line_h = font.get_linesize()
+        width = max(s.get_width() for s in rendered) + 20
+        height = line_h * len(rendered) + 20
+
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 170))
+        for i, s in enumerate(rendered):
+            surface.blit(s, (10, 10 + i * line_h))
+        return surface
+
+    def export(self, path):
+        """Xuất thống kê ra CSV hoặc JSON (theo đuôi file)"""
+        stats = self.stats()
+        if path.lower().endswith('.csv'):
+            fields = ['avg_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'count', 'total_ms']
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(['stage'] + fields)
+                for name, st in stats.items():
+                    writer.writerow([name] + [round(st[k], 4) for k in fields])
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(stats, f, indent=2, ensure_ascii=False)
+        print(f"📊 Đã xuất profile ({len(stats)} công đoạn) vào '{path}'")
@@ -0,0 +1,17 @@
+# core/game_clock.py
+
+
+class GameClock:
+    """
+    Đồng hồ thời gian game (giây mô phỏng), chỉ chạy khi được advance().
+    - Đã nhân time_scale (slow motion làm chậm cả combo/power-up/spawn)
+    - Headless/benchmark có thể tua nhanh cả ván mà vẫn đúng nhịp như chơi thật
+    """
+    def __init__(self, start=0.0):
+        self.time = start
+
+    def now(self):
+        return self.time
+
+    def advance(self, dt):
+        self.time += dt
@@ -1,4 +1,5 @@
 # core/hand_data.py
+import numpy as np
 from settings import FINGER_THICKNESS 
 
 class HandModel:
@@ -15,6 +16,14 @@ class HandModel:
 
     PALM_INDICES = [0, 1, 5, 9, 13, 17]
 
+    # Các tam giác màng giữa các ngón (để vẽ)
+    WEBBING_GROUPS = [[0, 5, 9], [0, 9, 13], [0, 13, 17]]
+
+    # Dạng mảng numpy - dùng để gom điểm (gather) từ mảng landmarks (21, 2)
+    CONNECTIONS_ARRAY = np.array(CONNECTIONS, dtype=np.intp)
+    PALM_INDICES_ARRAY = np.array(PALM_INDICES, dtype=np.intp)
+    WEBBING_GROUPS_ARRAY = np.array(WEBBING_GROUPS, dtype=np.intp)
+
 
 class HandStyle:
     """
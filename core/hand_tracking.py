@@ -1,6 +1,10 @@
 # core/hand_tracking.py
 import cv2
 import numpy as np
+from settings import (
+    HAND_TRACKING_PRESET, HAND_TRACKING_PRESETS,
+    HAND_ROI_MARGIN, HAND_ROI_MIN_SIZE, HAND_ROI_REFRESH_FRAMES
+)
 
 # Import mediapipe theo cách mới
 try:
@@ -12,35 +16,128 @@ except:
     import mediapipe as mp
     USE_NEW_API = False
 
+NUM_LANDMARKS = 21
+
+
 class HandTracker:
-    def __init__(self, max_hands=2):
+    def __init__(self, max_hands=2, preset=None, inference_width=None, use_roi=None):
+        # Preset quyết định model_complexity + ngưỡng; tham số truyền vào được ưu tiên
+        config = dict(HAND_TRACKING_PRESETS[preset or HAND_TRACKING_PRESET])
+        if inference_width is not None:
+            config['inference_width'] = inference_width
+        if use_roi is not None:
+            config['use_roi'] = use_roi
+        self.config = config
+
         if USE_NEW_API:
             # API mới (mediapipe >= 0.10.8)
             try:
                 self.mp_hands = mp.solutions.hands
-                self.hands = self.mp_hands.Hands(
-                    max_num_hands=max_hands,
-                    min_detection_confidence=0.7,
-                    min_tracking_confidence=0.7
-                )
+                self.hands = self._create_hands(max_hands, config)
+                self.roi_hands = self._create_hands(max_hands, config, static=True) if config['use_roi'] else None
                 self.results = None
             except:
                 raise Exception("Không thể khởi tạo MediaPipe Hands")
         else:
             # API cũ
             self.mp_hands = mp.solutions.hands
-            self.hands = self.mp_hands.Hands(
-                max_num_hands=max_hands,
-                min_detection_confidence=0.7,
-                min_tracking_confidence=0.7
-            )
+            self.hands = self._create_hands(max_hands, config)
+            self.roi_hands = self._create_hands(max_hands, config, static=True) if config['use_roi'] else None
             self.results = None
 
+        self.max_hands = max_hands
+        self.inference_width = config['inference_width']
+        self.use_roi = config['use_roi']
+
+        # Landmarks đã quy về tọa độ chuẩn hóa (0..1) của TOÀN khung hình
+        self.landmarks = np.zeros((max_hands, NUM_LANDMARKS, 2), dtype=np.float32)
+        self.num_hands = 0
+        # Bộ đệm pixel cấp phát sẵn cho get_hand_landmarks_array()
+        self._pixel_buffer = np.zeros((max_hands, NUM_LANDMARKS, 2), dtype=np.float32)
+
+        # ROI: vùng bao tay của khung trước (pixel của khung camera)
+        self.roi = None
+        self.frames_since_full = 0
+
+    def _create_hands(self, max_hands, config, static=False):
+        """
+        static=False: chế độ streaming - MediaPipe đặt vùng tìm tay của khung sau theo landmarks
+        khung trước (tọa độ chuẩn hóa của ảnh trước) -> chỉ hợp với ảnh luôn cùng một khung hình.
+        static=True: mỗi ảnh nhận diện độc lập - dùng cho vùng cắt ROI (di chuyển mỗi khung).
+        """
+        return self.mp_hands.Hands(
+            static_image_mode=static,
+            max_num_hands=max_hands,
+            model_complexity=config['model_complexity'],
+            min_detection_confidence=config['min_detection_confidence'],
+            min_tracking_confidence=config['min_tracking_confidence']
+        )
+
     def process(self, frame):
         """Xử lý khung hình để tìm bàn tay"""
+        frame_h, frame_w = frame.shape[:2]
+
+        # Thử trong ROI trước, định kỳ quét toàn khung để bắt tay mới xuất hiện
+        if self.use_roi and self.roi is not None and self.frames_since_full < HAND_ROI_REFRESH_FRAMES:
+            x0, y0, x1, y1 = self.roi
+            self.frames_since_full += 1
+            if self._detect(self.roi_hands, frame[y0:y1, x0:x1], x0, y0, frame_w, frame_h):
+                return
+
+        # Fallback: nhận diện trên toàn khung
+        self.frames_since_full = 0
+        self._detect(self.hands, frame, 0, 0, frame_w, frame_h)
+
+    def _detect(self, hands_model, image, offset_x, offset_y, frame_w, frame_h):
+        """
+        Chạy MediaPipe trên ảnh (toàn khung hoặc vùng cắt), quy đổi về toàn khung.
+        Mỗi kiểu khung hình có một instance Hands riêng để trạng thái tracking không lẫn nhau.
+        """
+        region_h, region_w = image.shape[:2]
+
+        # Giảm độ phân giải trước khi đổi màu (rẻ hơn)
+        if self.inference_width and region_w > self.inference_width:
+            scale = self.inference_width / region_w
+            image = cv2.resize(image, (self.inference_width, max(1, int(region_h * scale))),
+                               interpolation=cv2.INTER_LINEAR)
+
         # Chuyển BGR sang RGB
-        img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        self.results = self.hands.process(img_rgb)
+        img_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        self.results = hands_model.process(img_rgb)
+
+        if not (self.results and self.results.multi_hand_landmarks):
+            self.num_hands = 0
+            self.roi = None
+            return False
+
+        hands = self.results.multi_hand_landmarks[:self.max_hands]
+        for h, hand_lms in enumerate(hands):
+            for idx, lm in enumerate(hand_lms.landmark):
+                self.landmarks[h, idx, 0] = (lm.x * region_w + offset_x) / frame_w
+                self.landmarks[h, idx, 1] = (lm.y * region_h + offset_y) / frame_h
+        self.num_hands = len(hands)
+
+        self._update_roi(frame_w, frame_h)
+        return True
+
+    def _update_roi(self, frame_w, frame_h):
+        """Tính vùng bao (có lề) quanh các bàn tay cho khung kế tiếp"""
+        pts = self.landmarks[:self.num_hands].reshape(-1, 2)
+        x_min, y_min = pts.min(axis=0) * (frame_w, frame_h)
+        x_max, y_max = pts.max(axis=0) * (frame_w, frame_h)
+
+        # Cạnh ROI (vuông): lớn hơn tay một khoảng lề, không nhỏ hơn mức tối thiểu
+        size = max(x_max - x_min, y_max - y_min) * (1 + 2 * HAND_ROI_MARGIN)
+        half = max(size, HAND_ROI_MIN_SIZE * min(frame_w, frame_h)) / 2
+        cx = (x_min + x_max) / 2
+        cy = (y_min + y_max) / 2
+
+        x0 = max(0, int(cx - half))
+        y0 = max(0, int(cy - half))
+        x1 = min(frame_w, int(cx + half))
+        y1 = min(frame_h, int(cy + half))
+
+        self.roi = (x0, y0, x1, y1) if x1 > x0 and y1 > y0 else None
 
     def get_hand_landmarks(self, width, height):
         """
@@ -48,35 +145,37 @@ class HandTracker:
         Dùng cho việc tạo vật lý (Physics).
         """
         all_hands_points = []
-        if self.results and self.results.multi_hand_landmarks:
-            for hand_lms in self.results.multi_hand_landmarks:
-                points = {}
-                for id, lm in enumerate(hand_lms.landmark):
-                    cx, cy = int(lm.x * width), int(lm.y * height)
-                    points[id] = (cx, cy)
-                all_hands_points.append(points)
+        for hand in self.landmarks[:self.num_hands]:
+            points = {}
+            for id, (x, y) in enumerate(hand.tolist()):
+                points[id] = (int(x * width), int(y * height))
+            all_hands_points.append(points)
         return all_hands_points
 
+    def get_hand_landmarks_array(self, width, height):
+        """
+        Trả về mảng (n_hands, 21, 2) float32 tọa độ pixel.
+        Mảng là view của bộ đệm dùng lại - bị ghi đè ở lần gọi sau.
+        """
+        out = self._pixel_buffer[:self.num_hands]
+        np.multiply(self.landmarks[:self.num_hands], (width, height), out=out)
+        return out
+
     def get_shadow_polygons(self, width, height):
         """
         Trả về danh sách các đa giác (Polygon) bao quanh bàn tay.
         Dùng để VẼ BÓNG (Visual).
         """
         polygons = []
-        if self.results and self.results.multi_hand_landmarks:
-            for hand_lms in self.results.multi_hand_landmarks:
-                # 1. Lấy tất cả tọa độ điểm của 1 bàn tay
-                point_list = []
-                for lm in hand_lms.landmark:
-                    cx, cy = int(lm.x * width), int(lm.y * height)
-                    point_list.append([cx, cy])
-                
-                # 2. Dùng thuật toán Convex Hull để tìm đường bao ngoài cùng
-                point_array = np.array(point_list, dtype=np.int32)
-                hull = cv2.convexHull(point_array)
-                
-                # 3. Chuẩn hóa format để Pygame vẽ được
-                polygon_points = [pt[0].tolist() for pt in hull]
-                polygons.append(polygon_points)
-                
-        return polygons
\ No newline at end of file
+        for hand in self.landmarks[:self.num_hands]:
+            # 1. Lấy tất cả tọa độ điểm của 1 bàn tay
+            point_array = (hand * (width, height)).astype(np.int32)
+
+            # 2. Dùng thuật toán Convex Hull để tìm đường bao ngoài cùng
+            hull = cv2.convexHull(point_array)
+
+            # 3. Chuẩn hóa format để Pygame vẽ được
+            polygon_points = [pt[0].tolist() for pt in hull]
+            polygons.append(polygon_points)
+
+        return polygons
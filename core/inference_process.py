@@ -0,0 +1,283 @@
+# core/inference_process.py
+import multiprocessing as mp
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from core.capture_worker import LandmarkResult, EMPTY_RESULT, NUM_LANDMARKS
+from settings import HAND_PROCESS_START_TIMEOUT
+
+# Header kết quả (int64): [số kết quả, seq khung đã xử lý, số tay, số khung bị bỏ qua,
+#                         thời điểm chụp khung (perf_counter_ns của tiến trình game)]
+_HDR_RESULT_SEQ = 0
+_HDR_FRAME_SEQ = 1
+_HDR_NUM_HANDS = 2
+_HDR_SKIPPED = 3
+_HDR_TIMESTAMP_NS = 4
+_HEADER_LEN = 5
+_HEADER_BYTES = _HEADER_LEN * 8
+
+
+def _result_views(buf, max_hands):
+    """Tạo các view numpy trên vùng nhớ kết quả dùng chung"""
+    header = np.ndarray((_HEADER_LEN,), dtype=np.int64, buffer=buf)
+    landmarks = np.ndarray((max_hands, NUM_LANDMARKS, 2), dtype=np.float32,
+                           buffer=buf, offset=_HEADER_BYTES)
+    return header, landmarks
+
+
+def _inference_main(ring_name, ring_size, frame_shape, result_name, max_hands, preset,
+                    width, height, slot_queue, free_slots, result_lock, stop_event, ready_event):
+    """
+    Tiến trình con: lấy khung từ ring buffer, chạy HandTracker,
+    ghi landmarks vào mảng kích thước cố định.
+    Slot nào đã copy xong (hoặc bị bỏ qua) được trả lại bên ghi qua `free_slots`.
+    Báo `ready_event` khi HandTracker đã khởi tạo xong.
+    """
+    from core.hand_tracking import HandTracker
+
+    ring_shm = shared_memory.SharedMemory(name=ring_name)
+    result_shm = shared_memory.SharedMemory(name=result_name)
+    ring = np.ndarray((ring_size, *frame_shape), dtype=np.uint8, buffer=ring_shm.buf)
+    header, landmarks = _result_views(result_shm.buf, max_hands)
+
+    tracker = HandTracker(max_hands=max_hands, preset=preset)
+    ready_event.set()
+    skipped = 0
+
+    try:
+        while not stop_event.is_set():
+            try:
+                item = slot_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            # Luôn xử lý khung MỚI NHẤT, bỏ qua các khung cũ còn trong hàng đợi
+            while item is not None:
+                try:
+                    newer = slot_queue.get_nowait()
+                except queue.Empty:
+                    break
+                skipped += 1
+                if newer is not None:
+                    free_slots.put(item[0])
+                item = newer
+            if item is None:
+                break
+
+            slot, frame_seq, timestamp_ns = item
+            # Copy xong mới trả slot -> bên ghi không thể ghi đè khung đang đọc
+            frame = ring[slot].copy()
+            free_slots.put(slot)
+            tracker.process(frame)
+
+            hands = tracker.get_hand_landmarks_array(width, height)
+
+            with result_lock:
+                landmarks[:len(hands)] = hands
+                header[_HDR_NUM_HANDS] = len(hands)
+                header[_HDR_FRAME_SEQ] = frame_seq
+                header[_HDR_SKIPPED] = skipped
+                header[_HDR_TIMESTAMP_NS] = timestamp_ns
+                header[_HDR_RESULT_SEQ] += 1
+    finally:
+        del ring, header, landmarks
+        ring_shm.close()
+        result_shm.close()
+
+
+class ProcessHandSource:
+    """
+    Chạy HandTracker ở một TIẾN TRÌNH riêng (khác lõi CPU với vòng lặp game).
+    - Khung hình đi vào qua ring buffer trong shared memory (không pickle khung).
+    - Landmarks trả về qua mảng kích thước cố định trong shared memory.
+    Dùng chung giao diện với CaptureWorker: start() / get_latest() / stop().
+    """
+    def __init__(self, width, height, camera_index=0, max_hands=2, ring_size=4, preset=None,
+                 profiler=None):
+        self.profiler = profiler
+        self.width = width
+        self.height = height
+        self.camera_index = camera_index
+        self.max_hands = max_hands
+        self.preset = preset
+        self.ring_size = ring_size
+
+        self.cap = None
+        self._ctx = mp.get_context('spawn')
+        self._process = None
+        self._thread = None
+        self._running = False
+
+        self._ring_shm = None
+        self._result_shm = None
+        self._ring = None
+        self._header = None
+        self._landmarks = None
+
+        self._slot_queue = None
+        self._free_slots = None
+        self._result_lock = None
+        self._stop_event = None
+        self._ready_event = None
+
+        self._last_result_seq = 0
+        self._skipped_in_child = 0
+        self._latest = EMPTY_RESULT
+        # Bộ đệm phía game (dùng lại mỗi lần đọc kết quả mới)
+        self._front = np.zeros((max_hands, NUM_LANDMARKS, 2), dtype=np.float32)
+
+        # --- BỘ ĐẾM (giống CaptureWorker) ---
+        self.frames_captured = 0
+        self.frames_processed = 0
+        self.dropped_frames = 0
+        self.stale_frames = 0
+        self.read_failures = 0
+
+    def start(self):
+        """Mở webcam, cấp phát shared memory và khởi động tiến trình nhận diện"""
+        self.cap = cv2.VideoCapture(self.camera_index)
+        self.cap.set(3, self.width)
+        self.cap.set(4, self.height)
+
+        # Kích thước khung thật do camera quyết định
+        success, frame = self.cap.read()
+        if not success:
+            frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        frame_shape = frame.shape
+
+        self._ring_shm = shared_memory.SharedMemory(create=True, size=self.ring_size * frame.nbytes)
+        self._ring = np.ndarray((self.ring_size, *frame_shape), dtype=np.uint8, buffer=self._ring_shm.buf)
+
+        result_size = _HEADER_BYTES + self.max_hands * NUM_LANDMARKS * 2 * 4
+        self._result_shm = shared_memory.SharedMemory(create=True, size=result_size)
+        self._header, self._landmarks = _result_views(self._result_shm.buf, self.max_hands)
+        self._header[:] = 0
+
+        # Slot thuộc về bên ghi khi nằm trong _free_slots, thuộc tiến trình con khi nằm trong _slot_queue
+        self._slot_queue = self._ctx.Queue(maxsize=self.ring_size)
+        self._free_slots = self._ctx.Queue(maxsize=self.ring_size)
+        for slot in range(self.ring_size):
+            self._free_slots.put(slot)
+        self._result_lock = self._ctx.Lock()
+        self._stop_event = self._ctx.Event()
+        self._ready_event = self._ctx.Event()
+
+        self._process = self._ctx.Process(
+            target=_inference_main,
+            args=(self._ring_shm.name, self.ring_size, frame_shape, self._result_shm.name,
+                  self.max_hands, self.preset, self.width, self.height,
+                  self._slot_queue, self._free_slots, self._result_lock, self._stop_event,
+                  self._ready_event),
+            name="HandInference",
+            daemon=True
+        )
+        self._process.start()
+        self._wait_ready()
+
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name="FrameRingWriter", daemon=True)
+        self._thread.start()
+
+    def _wait_ready(self):
+        """Chờ tiến trình con khởi tạo xong HandTracker; lỗi/quá hạn -> dọn dẹp và báo lỗi"""
+        deadline = time.perf_counter() + HAND_PROCESS_START_TIMEOUT
+        while not self._ready_event.wait(0.1):
+            if not self._process.is_alive() or time.perf_counter() > deadline:
+                exitcode = self._process.exitcode
+                self.stop()
+                raise Exception(f"Tiến trình nhận diện tay không khởi động được (exitcode={exitcode})")
+
+    def _check_alive(self):
+        """Tiến trình con chết giữa chừng -> báo lỗi thay vì trả mãi khung cũ"""
+        if not self._process.is_alive():
+            raise Exception(f"Tiến trình nhận diện tay đã dừng (exitcode={self._process.exitcode})")
+
+    def _capture_loop(self):
+        """Luồng ghi: đọc camera và lật ảnh thẳng vào slot của ring buffer"""
+        while self._running:
+            start_ns = time.perf_counter_ns()
+            success, frame = self.cap.read()
+            if not success:
+                self.read_failures += 1
+                time.sleep(0.005)
+                continue
+            timestamp_ns = time.perf_counter_ns()
+            if self.profiler:
+                self.profiler.add('camera.read', (timestamp_ns - start_ns) / 1e9)
+
+            self.frames_captured += 1
+            try:
+                slot = self._free_slots.get_nowait()
+            except queue.Empty:
+                # Tiến trình con còn giữ mọi slot (nhận diện chậm) -> bỏ khung này
+                self.dropped_frames += 1
+                continue
+
+            cv2.flip(frame, 1, dst=self._ring[slot])
+            # Chỉ gửi chỉ số slot (vài số nguyên), không gửi dữ liệu ảnh
+            self._slot_queue.put((slot, self.frames_captured, timestamp_ns))
+
+    def get_latest(self):
+        """
+        Đọc landmarks mới nhất từ shared memory - không chặn.
+        Mảng hands trong kết quả được dùng lại ở lần gọi sau.
+        """
+        if self._header is None:
+            return self._latest
+
+        with self._result_lock:
+            result_seq = int(self._header[_HDR_RESULT_SEQ])
+            if result_seq == self._last_result_seq:
+                self.stale_frames += 1
+                self._check_alive()
+                return self._latest
+            n = int(self._header[_HDR_NUM_HANDS])
+            self._front[:n] = self._landmarks[:n]
+            skipped = int(self._header[_HDR_SKIPPED])
+            timestamp = int(self._header[_HDR_TIMESTAMP_NS]) / 1e9
+
+        # Kết quả bị ghi đè trước khi game kịp đọc
+        if self._last_result_seq > 0:
+            self.dropped_frames += result_seq - self._last_result_seq - 1
+        self._last_result_seq = result_seq
+        self.frames_processed = result_seq
+        self._skipped_in_child = skipped
+
+        self._latest = LandmarkResult(result_seq, timestamp, self._front[:n])
+        return self._latest
+
+    def stop(self):
+        """Dừng tiến trình con và giải phóng shared memory"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+        if self._process is not None:
+            self._stop_event.set()
+            self._process.join(timeout=2.0)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+        self._ring = None
+        self._header = None
+        self._landmarks = None
+        for shm in (self._ring_shm, self._result_shm):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+        self._ring_shm = None
+        self._result_shm = None
+
+        print(f"📷 Camera (tiến trình riêng): {self.frames_processed} khung | "
+              f"bỏ qua: {self.dropped_frames + self._skipped_in_child} | cũ: {self.stale_frames}")
@@ -0,0 +1,69 @@
+# core/landmark_filter.py
+import math
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+
+class OneEuroFilter:
+    """
+    Bộ lọc One Euro cho TẤT CẢ landmarks cùng lúc (NumPy, không vòng lặp Python).
+    - Tay đứng yên: cắt tần số thấp -> hết rung
+    - Tay di chuyển nhanh: tần số cắt tăng theo tốc độ -> không bị trễ
+    Trạng thái lưu riêng cho từng bàn tay (theo thứ tự tay trong mảng).
+    """
+    def __init__(self, max_hands=2, min_cutoff=1.5, beta=0.01, d_cutoff=1.0, reset_distance=200.0):
+        self.min_cutoff = min_cutoff          # Hz - càng thấp càng mượt khi đứng yên
+        self.beta = beta                      # Độ nhạy theo tốc độ (theo pixel/giây)
+        self.d_cutoff = d_cutoff              # Hz - lọc đạo hàm
+        self.reset_distance = reset_distance  # Tay "nhảy" xa hơn -> coi như tay khác
+
+        self.x_prev = np.zeros((max_hands, NUM_LANDMARKS, 2), dtype=np.float32)
+        self.dx_prev = np.zeros_like(self.x_prev)
+        self.t_prev = np.zeros(max_hands, dtype=np.float64)
+        self.initialized = np.zeros(max_hands, dtype=bool)
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def filter(self, hands, timestamp):
+        """
+        hands: mảng (n, 21, 2). Trả về mảng đã lọc cùng kích thước
+        (view của bộ đệm nội bộ - bị ghi đè ở lần gọi sau).
+        """
+        n = len(hands)
+        self.initialized[n:] = False
+        if n == 0:
+            return self.x_prev[:0]
+
+        x = hands
+        x_prev = self.x_prev[:n]
+        dx_prev = self.dx_prev[:n]
+
+        # Tay mới xuất hiện hoặc nhảy quá xa (MediaPipe đổi thứ tự tay) -> khởi tạo lại
+        jump = np.abs(x.mean(axis=1) - x_prev.mean(axis=1)).max(axis=1)
+        valid = self.initialized[:n] & (jump < self.reset_distance) & (timestamp > self.t_prev[:n])
+
+        dt = np.where(valid, timestamp - self.t_prev[:n], 1.0)[:, None, None]
+
+        # Đạo hàm đã lọc
+        dx = (x - x_prev) / dt
+        dx_hat = dx_prev + self._alpha(self.d_cutoff, dt) * (dx - dx_prev)
+
+        # Tần số cắt thích nghi theo tốc độ từng điểm
+        speed = np.sqrt((dx_hat ** 2).sum(axis=2, keepdims=True))
+        cutoff = self.min_cutoff + self.beta * speed
+        x_hat = x_prev + self._alpha(cutoff, dt) * (x - x_prev)
+
+        keep = valid[:, None, None]
+        self.x_prev[:n] = np.where(keep, x_hat, x)
+        self.dx_prev[:n] = np.where(keep, dx_hat, 0.0)
+        self.t_prev[:n] = timestamp
+        self.initialized[:n] = True
+        return self.x_prev[:n]
+
+    def reset(self):
+        self.initialized[:] = False
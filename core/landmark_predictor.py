@@ -0,0 +1,63 @@
+# core/landmark_predictor.py
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+
+class LandmarkPredictor:
+    """
+    Dự đoán vị trí tay giữa các khung camera (~30 FPS) cho vòng lặp game (60 FPS).
+    - 'extrapolate': ngoại suy tuyến tính từ 2 mẫu gần nhất tới thời điểm hiện tại
+    - 'interpolate': nội suy giữa 2 mẫu gần nhất (trễ thêm 1 khung camera, mượt hơn)
+    - None: dùng nguyên mẫu mới nhất
+    """
+    def __init__(self, max_hands=2, mode='extrapolate', max_extrapolation=0.05):
+        self.mode = mode
+        self.max_extrapolation = max_extrapolation  # Giây, tránh "bay" tay khi camera khựng
+
+        # Hai mẫu gần nhất (bộ đệm cố định)
+        self.prev = np.zeros((max_hands, NUM_LANDMARKS, 2), dtype=np.float32)
+        self.curr = np.zeros_like(self.prev)
+        self.out = np.zeros_like(self.prev)
+        self.prev_time = 0.0
+        self.curr_time = 0.0
+        self.count = 0
+        self.has_prev = False
+
+    def push(self, hands, timestamp):
+        """Thêm một mẫu mới từ camera (hands: mảng (n, 21, 2))"""
+        n = len(hands)
+
+        # Số tay thay đổi -> không ghép được mẫu cũ với mẫu mới
+        self.has_prev = (n == self.count and n > 0 and timestamp > self.curr_time)
+        if self.has_prev:
+            self.prev, self.curr = self.curr, self.prev
+            self.prev_time = self.curr_time
+
+        self.curr[:n] = hands
+        self.curr_time = timestamp
+        self.count = n
+
+    def predict(self, t):
+        """Trả về mảng (n, 21, 2) ước lượng tại thời điểm t (cùng đồng hồ với timestamp)"""
+        n = self.count
+        if self.mode is None or not self.has_prev:
+            return self.curr[:n]
+
+        interval = self.curr_time - self.prev_time
+        if self.mode == 'interpolate':
+            # Trễ 1 khung camera: t - interval nằm giữa prev và curr
+            alpha = min(max((t - interval - self.prev_time) / interval, 0.0), 1.0)
+        else:
+            ahead = min(max(t - self.curr_time, 0.0), self.max_extrapolation)
+            alpha = 1.0 + ahead / interval
+
+        # out = prev + (curr - prev) * alpha
+        np.subtract(self.curr[:n], self.prev[:n], out=self.out[:n])
+        self.out[:n] *= alpha
+        self.out[:n] += self.prev[:n]
+        return self.out[:n]
+
+    def reset(self):
+        self.count = 0
+        self.has_prev = False
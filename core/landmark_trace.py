@@ -0,0 +1,147 @@
+# core/landmark_trace.py
+import time
+
+import numpy as np
+
+from core.capture_worker import LandmarkResult, NUM_LANDMARKS
+
+# File trace: header 16 byte + các bản ghi kích thước cố định (đọc bằng np.memmap)
+TRACE_MAGIC = b"LMTRACE1"
+TRACE_HEADER_BYTES = 16
+
+
+def trace_dtype(max_hands):
+    """Kiểu bản ghi của một khung: thời điểm chụp, số tay, landmarks (pixel)"""
+    return np.dtype([
+        ('timestamp', '<f8'),
+        ('num_hands', '<i4'),
+        ('reserved', '<i4'),
+        ('hands', '<f4', (max_hands, NUM_LANDMARKS, 2)),
+    ])
+
+
+class LandmarkRecorder:
+    """Ghi output của HandTracker (mỗi khung camera) ra file nhị phân stride cố định"""
+    def __init__(self, path, max_hands=2):
+        self.path = path
+        self.max_hands = max_hands
+        self.frames_written = 0
+
+        self._record = np.zeros(1, dtype=trace_dtype(max_hands))
+        self._file = open(path, "wb")
+        header = np.array([max_hands, 0], dtype='<i4').tobytes()
+        self._file.write(TRACE_MAGIC + header)
+
+    def record(self, hands, timestamp):
+        """hands: mảng (n, 21, 2) pixel; timestamp: giây"""
+        n = min(len(hands), self.max_hands)
+        rec = self._record[0]
+        rec['timestamp'] = timestamp
+        rec['num_hands'] = n
+        rec['hands'][:n] = hands[:n]
+        rec['hands'][n:] = 0
+        self._file.write(self._record.tobytes())
+        self.frames_written += 1
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+            print(f"💾 Đã ghi {self.frames_written} khung landmarks vào '{self.path}'")
+
+
+def open_trace(path):
+    """Memory-map file trace, trả về mảng bản ghi (chỉ đọc)"""
+    with open(path, "rb") as f:
+        head = f.read(TRACE_HEADER_BYTES)
+    if head[:8] != TRACE_MAGIC:
+        raise ValueError(f"'{path}' không phải file trace landmarks")
+    max_hands = int(np.frombuffer(head[8:12], dtype='<i4')[0])
+    return np.memmap(path, dtype=trace_dtype(max_hands), mode='r', offset=TRACE_HEADER_BYTES)
+
+
+class TraceReplaySource:
+    """
+    Phát lại file trace thay cho camera (workload lặp lại được để profile).
+    - realtime=True: phát theo đúng nhịp thời gian đã ghi
+    - realtime=False: cứ `frame_interval` lần gọi get_latest() lấy 1 bản ghi (tất định)
+    Cùng giao diện với CaptureWorker: start() / get_latest() / stop().
+    time_func: nguồn thời gian cho nhịp phát + timestamp (headless thay bằng đồng hồ mô phỏng).
+    """
+    def __init__(self, path, realtime=True, loop=True, frame_interval=2, time_func=time.perf_counter):
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self.frame_interval = frame_interval
+        self.time_func = time_func
+
+        self.records = open_trace(path)
+        self.max_hands = self.records.dtype['hands'].shape[0]
+        # Cột thời gian (liền mạch) để tìm kiếm nhị phân khi phát theo thời gian thật
+        self._timestamps = np.ascontiguousarray(self.records['timestamp'])
+        self._buffer = np.zeros((self.max_hands, NUM_LANDMARKS, 2), dtype=np.float32)
+        self._latest = LandmarkResult(-1, 0.0, self._buffer[:0])
+
+        self._index = -1
+        self._age = 0.0
+        self._calls = 0
+        self._start_time = 0.0
+        self._first_timestamp = 0.0
+
+        # --- BỘ ĐẾM (giống CaptureWorker) ---
+        self.frames_processed = 0
+        self.dropped_frames = 0
+        self.stale_frames = 0
+        self.read_failures = 0
+
+    def start(self):
+        self._start_time = self.time_func()
+        if len(self.records):
+            self._first_timestamp = float(self._timestamps[0])
+
+    def _next_index(self):
+        """Chỉ số bản ghi cần phát ở thời điểm hiện tại"""
+        count = len(self.records)
+        if self.realtime:
+            elapsed = self.time_func() - self._start_time
+            if self.loop:
+                duration = float(self._timestamps[-1]) - self._first_timestamp
+                if duration > 0:
+                    elapsed %= duration
+            target = self._first_timestamp + elapsed
+            index = max(0, int(np.searchsorted(self._timestamps, target, side='right')) - 1)
+            # Khung đã "được chụp" cách đây bao lâu (để gán timestamp đúng nhịp đã ghi)
+            self._age = target - float(self._timestamps[index])
+            return index
+
+        self._calls += 1
+        if self._calls % self.frame_interval:
+            return self._index
+        index = self._index + 1
+        if index >= count:
+            index = 0 if self.loop else count - 1
+        return index
+
+    def get_latest(self):
+        if len(self.records) == 0:
+            return self._latest
+
+        index = self._next_index()
+        if index == self._index:
+            self.stale_frames += 1
+            return self._latest
+        if self._index >= 0 and index > self._index + 1:
+            self.dropped_frames += index - self._index - 1
+
+        rec = self.records[index]
+        n = int(rec['num_hands'])
+        self._buffer[:n] = rec['hands'][:n]
+        self._index = index
+        self.frames_processed += 1
+        timestamp = self.time_func() - self._age
+        self._latest = LandmarkResult(self.frames_processed, timestamp, self._buffer[:n])
+        return self._latest
+
+    def stop(self):
+        # Bỏ tham chiếu tới memmap để đóng file
+        self.records = np.zeros(0, dtype=self.records.dtype)
@@ -0,0 +1,91 @@
+# core/multi_source.py
+import numpy as np
+
+from core.capture_worker import NUM_LANDMARKS
+
+
+def split_regions(count, width, height):
+    """Chia sân thành `count` dải dọc bằng nhau (camera đặt cạnh nhau) -> [(x, y, w, h) pixel]"""
+    edges = np.linspace(0, width, count + 1).round().astype(int).tolist()
+    return [(x0, 0, x1 - x0, height) for x0, x1 in zip(edges, edges[1:])]
+
+
+class MultiCameraSource:
+    """
+    Gộp nhiều nguồn landmarks (mỗi camera một CaptureWorker/ProcessHandSource
+    chạy trên luồng/tiến trình riêng) thành một nguồn duy nhất.
+    - Nguồn thứ i trả tọa độ pixel theo khung chụp của nó (source.width x source.height)
+    - Khung chụp được ánh xạ vào vùng regions[i] = (x, y, w, h) của sân, GIỮ tỉ lệ:
+      phóng to vừa phủ kín vùng rồi cắt lấy cửa sổ ở giữa; tay có cổ tay nằm ngoài
+      vùng (phần bị cắt) bị bỏ, tránh lấn sang vùng camera bên cạnh
+    - Tay được xếp liên tiếp theo thứ tự camera vào một bộ đệm cố định
+    Mỗi camera có nhịp khung riêng -> không có get_latest() gộp: game lọc/dự đoán theo
+    từng nguồn trong `sources` (timestamp của chính camera đó) rồi mới gộp bằng merge().
+    start() / stop() và các bộ đếm áp dụng cho mọi camera.
+    """
+    def __init__(self, sources, regions):
+        if len(sources) != len(regions):
+            raise ValueError("Mỗi nguồn camera cần đúng một vùng trên sân")
+        self.sources = sources
+        self.scales = []
+        self.offsets = []
+        for source, (x, y, w, h) in zip(sources, regions):
+            scale = max(w / source.width, h / source.height)
+            self.scales.append(np.float32(scale))
+            self.offsets.append(np.array([x + (w - source.width * scale) / 2,
+                                          y + (h - source.height * scale) / 2], dtype=np.float32))
+        self.bounds = [(np.array([x, y], dtype=np.float32), np.array([x + w, y + h], dtype=np.float32))
+                       for x, y, w, h in regions]
+        self.max_hands = sum(source.max_hands for source in sources)
+
+        self._buffer = np.zeros((self.max_hands, NUM_LANDMARKS, 2), dtype=np.float32)
+
+    def start(self):
+        for source in self.sources:
+            source.start()
+
+    def merge(self, hands_per_source):
+        """Ghép tay của từng camera (theo thứ tự `sources`) vào tọa độ sân. Mảng trả về được dùng lại"""
+        n = 0
+        for hands, scale, offset, (lo, hi) in zip(hands_per_source, self.scales, self.offsets, self.bounds):
+            count = len(hands)
+            out = self._buffer[n:n + count]
+            np.multiply(hands, scale, out=out)
+            out += offset
+            # Bỏ tay nằm trong phần khung bị cắt (cổ tay ngoài vùng của camera này)
+            wrist = out[:, 0]
+            inside = ((wrist >= lo) & (wrist < hi)).all(axis=1)
+            kept = int(inside.sum())
+            if kept < count:
+                out[:kept] = out[inside]
+            n += kept
+        return self._buffer[:n]
+
+    def get_latest(self):
+        """
+        Không hỗ trợ: gộp kết quả thô sẽ gán timestamp mới cho tay cũ của các camera
+        chưa có khung mới -> bộ lọc/dự đoán thấy tay lúc đứng yên lúc nhảy.
+        Hãy đọc từng nguồn trong `sources`, lọc/dự đoán riêng rồi gộp bằng merge().
+        """
+        raise NotImplementedError("MultiCameraSource: đọc từng nguồn trong `sources` rồi gộp bằng merge()")
+
+    def stop(self):
+        for source in self.sources:
+            source.stop()
+
+    # --- BỘ ĐẾM (tổng của các camera) ---
+    @property
+    def frames_processed(self):
+        return sum(source.frames_processed for source in self.sources)
+
+    @property
+    def dropped_frames(self):
+        return sum(source.dropped_frames for source in self.sources)
+
+    @property
+    def stale_frames(self):
+        return sum(source.stale_frames for source in self.sources)
+
+    @property
+    def read_failures(self):
+        return sum(source.read_failures for source in self.sources)
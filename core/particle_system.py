@@ -1,46 +1,14 @@
 # core/particle_system.py
 import pygame
-import random
 import math
+import numpy as np
 from settings import (
     GRAVITY, PARTICLE_COUNT, PARTICLE_LIFETIME, 
     PARTICLE_SPEED_MIN, PARTICLE_SPEED_MAX,
     PARTICLE_SIZE_MIN, PARTICLE_SIZE_MAX,
-    STAR_TRAIL_LENGTH, POWERUP_TYPES
+    STAR_TRAIL_LENGTH, POWERUP_TYPES, PARTICLE_CAPACITY, PARTICLE_ALPHA_LEVELS
 )
 
-class Particle:
-    """Một hạt hiệu ứng đơn lẻ"""
-    def __init__(self, x, y, vx, vy, color, size, lifetime):
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.color = color
-        self.size = size
-        self.lifetime = lifetime
-        self.max_lifetime = lifetime
-        self.alpha = 255
-
-    def update(self, dt):
-        self.x += self.vx * dt
-        self.y += self.vy * dt
-        self.vy += GRAVITY * dt * 0.3  # Trọng lực nhẹ
-        self.lifetime -= dt
-        
-        # Fade out dần
-        self.alpha = int(255 * (self.lifetime / self.max_lifetime))
-        
-    def is_dead(self):
-        return self.lifetime <= 0
-
-    def draw(self, surface):
-        if self.alpha > 0:
-            color_with_alpha = (*self.color[:3], self.alpha)
-            pos = (int(self.x), int(self.y))
-            pygame.draw.circle(surface, color_with_alpha, pos, int(self.size))
-
-
 class StarTrail:
     """Vệt sao cho combo"""
     def __init__(self, x, y):
@@ -60,8 +28,9 @@ class StarTrail:
     
     def draw(self, surface):
         if len(self.positions) < 2:
-            return
+            return None
             
+        rect = None
         for i in range(len(self.positions) - 1):
             alpha = int(255 * (i / len(self.positions)))
             color = (255, 215, 0, alpha)  # Màu vàng
@@ -71,43 +40,80 @@ class StarTrail:
             
             # Vẽ line với độ dày giảm dần
             thickness = max(1, int(3 * (i / len(self.positions))))
-            pygame.draw.line(surface, color, start, end, thickness)
+            r = pygame.draw.line(surface, color, start, end, thickness)
+            rect = rect.union(r) if rect else r
+        return rect
 
 
 class ParticleSystem:
-    """Quản lý tất cả hiệu ứng particles"""
-    def __init__(self):
-        self.particles = []
+    """
+    Quản lý tất cả hiệu ứng particles.
+    Hạt lưu dạng struct-of-arrays (NumPy) trong pool dung lượng cố định:
+    hạt còn sống luôn nằm liền ở [:count], update vectorized + dồn mảng.
+    """
+    def __init__(self, capacity=PARTICLE_CAPACITY):
+        self.capacity = capacity
+        self.count = 0
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.zeros(capacity, dtype=np.float32)
+        self.max_lifetime = np.ones(capacity, dtype=np.float32)
+        self.alpha = np.zeros(capacity, dtype=np.int32)
+        self.dropped = 0   # Số hạt bị bỏ do pool đầy
+
+        self.rng = np.random.default_rng()
+        self.sprites = {}   # khóa (màu, bán kính, mức alpha) -> Surface
         self.star_trails = []
         self.particle_surface = None
         
     def init_surface(self, width, height):
         self.particle_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+
+    def _emit(self, x, y, angle, speed, vy_offset, color, size, lifetime):
+        """Ghi một loạt hạt vào các slot trống cuối pool (các tham số là mảng cùng độ dài)"""
+        n = min(len(angle), self.capacity - self.count)
+        self.dropped += len(angle) - n
+        if n <= 0:
+            return
+        sl = slice(self.count, self.count + n)
+        self.pos[sl] = (x, y)
+        self.vel[sl, 0] = np.cos(angle[:n]) * speed[:n]
+        self.vel[sl, 1] = np.sin(angle[:n]) * speed[:n] + vy_offset
+        self.color[sl] = color[:3]
+        self.size[sl] = size[:n] if np.ndim(size) else size
+        self.lifetime[sl] = lifetime[:n] if np.ndim(lifetime) else lifetime
+        self.max_lifetime[sl] = self.lifetime[sl]
+        self.alpha[sl] = 255
+        self.count += n
         
     def create_explosion(self, x, y, color, count=30):
         """Tạo hiệu ứng nổ khi ghi điểm"""
-        for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(PARTICLE_SPEED_MIN, PARTICLE_SPEED_MAX)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            size = random.uniform(PARTICLE_SIZE_MIN, PARTICLE_SIZE_MAX)
-            lifetime = random.uniform(0.5, PARTICLE_LIFETIME)
-            
-            particle = Particle(x, y, vx, vy, color, size, lifetime)
-            self.particles.append(particle)
+        rng = self.rng
+        self._emit(
+            x, y,
+            angle=rng.uniform(0, 2 * math.pi, count),
+            speed=rng.uniform(PARTICLE_SPEED_MIN, PARTICLE_SPEED_MAX, count),
+            vy_offset=0,
+            color=color,
+            size=rng.uniform(PARTICLE_SIZE_MIN, PARTICLE_SIZE_MAX, count),
+            lifetime=rng.uniform(0.5, PARTICLE_LIFETIME, count),
+        )
     
     def create_combo_stars(self, x, y, combo_count):
         """Tạo hiệu ứng sao cho combo"""
-        # Sao lớn ở giữa
-        for _ in range(5):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(50, 150)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed - 200  # Bay lên trên
-            
-            star = Particle(x, y, vx, vy, (255, 215, 0), 10, 1.5)
-            self.particles.append(star)
+        # Sao lớn ở giữa, bay lên trên
+        rng = self.rng
+        self._emit(
+            x, y,
+            angle=rng.uniform(0, 2 * math.pi, 5),
+            speed=rng.uniform(50, 150, 5),
+            vy_offset=-200,
+            color=(255, 215, 0),
+            size=10,
+            lifetime=1.5,
+        )
         
         # Thêm vệt sao nếu combo cao
         if combo_count >= 5:
@@ -117,20 +123,38 @@ class ParticleSystem:
     def create_powerup_collect(self, x, y, powerup_type):
         """Hiệu ứng khi nhặt power-up"""
         color = POWERUP_TYPES[powerup_type]['color']
-        for _ in range(15):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(80, 200)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed - 100
-            
-            particle = Particle(x, y, vx, vy, color, 6, 1.0)
-            self.particles.append(particle)
+        rng = self.rng
+        self._emit(
+            x, y,
+            angle=rng.uniform(0, 2 * math.pi, 15),
+            speed=rng.uniform(80, 200, 15),
+            vy_offset=-100,
+            color=color,
+            size=6,
+            lifetime=1.0,
+        )
     
     def update(self, dt, ball_pos=None):
-        # Update particles
-        self.particles = [p for p in self.particles if not p.is_dead()]
-        for particle in self.particles:
-            particle.update(dt)
+        # Dồn các hạt còn sống về đầu pool (hạt chết được tái sử dụng slot)
+        n = self.count
+        if n:
+            alive = self.lifetime[:n] > 0
+            if not alive.all():
+                keep = np.flatnonzero(alive)
+                n = len(keep)
+                for arr in (self.pos, self.vel, self.color, self.size,
+                            self.lifetime, self.max_lifetime):
+                    arr[:n] = arr[keep]
+                self.count = n
+        
+        # Update particles (tích phân + trọng lực nhẹ + mờ dần)
+        if n:
+            pos, vel = self.pos[:n], self.vel[:n]
+            pos += vel * dt
+            vel[:, 1] += GRAVITY * dt * 0.3
+            lifetime = self.lifetime[:n]
+            lifetime -= dt
+            self.alpha[:n] = (255 * (lifetime / self.max_lifetime[:n])).astype(np.int32)
         
         # Update star trails
         if ball_pos:
@@ -139,23 +163,66 @@ class ParticleSystem:
         
         self.star_trails = [t for t in self.star_trails if t.active]
     
+    def _circle_sprite(self, key):
+        """Sprite hình tròn dựng sẵn, khóa mã hóa (màu, bán kính, mức alpha đã lượng tử hóa)"""
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            rgb, rest = divmod(key, 1 << 16)
+            radius, alpha_level = divmod(rest, 256)
+            color = ((rgb >> 16) & 255, (rgb >> 8) & 255, rgb & 255)
+            step = 256 // PARTICLE_ALPHA_LEVELS
+            sprite = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*color, alpha_level * step + step // 2), (radius, radius), radius)
+            self.sprites[key] = sprite
+        return sprite
+
     def draw(self, screen):
-        if not self.particle_surface:
-            return
-            
-        self.particle_surface.fill((0, 0, 0, 0))
+        """Vẽ hiệu ứng, trả về vùng màn hình bị thay đổi (None nếu không có gì)"""
+        if not self.particle_surface or not (self.count or self.star_trails):
+            return None
+        
+        surface = self.particle_surface
+        rects = []
         
         # Vẽ star trails trước
         for trail in self.star_trails:
-            trail.draw(self.particle_surface)
+            rects.append(trail.draw(surface))
         
-        # Vẽ particles
-        for particle in self.particles:
-            particle.draw(self.particle_surface)
+        # Vẽ particles: 1 lần blits() các sprite dựng sẵn
+        n = self.count
+        visible = np.flatnonzero((self.alpha[:n] > 0) & (self.size[:n] >= 1))
+        if len(visible):
+            xy = self.pos[visible].astype(np.int32)
+            radius = self.size[visible].astype(np.int32)
+            levels = self.alpha[visible] * PARTICLE_ALPHA_LEVELS // 256
+            
+            # Khóa sprite của từng hạt = (rgb << 16) | (bán kính << 8) | mức alpha
+            rgb = self.color[visible].astype(np.int64)
+            keys = (((rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]) << 16) | (radius << 8) | levels
+            unique, inverse = np.unique(keys, return_inverse=True)
+            sprites = [self._circle_sprite(k) for k in unique.tolist()]
+            
+            top_left = xy - radius[:, None]
+            flags = pygame.BLEND_RGBA_MAX
+            surface.blits([
+                (sprites[i], pos, None, flags)
+                for i, pos in zip(inverse.tolist(), top_left.tolist())
+            ], doreturn=False)
+            
+            x0, y0 = top_left.min(axis=0).tolist()
+            x1, y1 = (xy + radius[:, None]).max(axis=0).tolist()
+            rects.append(pygame.Rect(x0, y0, x1 - x0 + 1, y1 - y0 + 1))
         
-        screen.blit(self.particle_surface, (0, 0))
+        rects = [r for r in rects if r]
+        if not rects:
+            return None
+        area = rects[0].unionall(rects[1:]).clip(surface.get_rect())
+        dirty = screen.blit(surface, area, area)
+        # Xóa lớp hạt ngay sau khi blit -> khung sau bắt đầu với lớp trong suốt
+        surface.fill((0, 0, 0, 0), area)
+        return dirty
     
     def clear(self):
         """Xóa hết hiệu ứng"""
-        self.particles.clear()
-        self.star_trails.clear()
\ No newline at end of file
+        self.count = 0
+        self.star_trails.clear()
@@ -1,18 +1,35 @@
 # core/physics_manager.py
+import sys
 import pymunk
 import random
 import numpy as np
-import time
 from settings import (
     WIDTH, HEIGHT, GRAVITY, BALL_RADIUS, BALL_ELASTICITY, BALL_FRICTION,
     BASKET_X, BASKET_Y, BASKET_WIDTH, BASKET_HEIGHT, COLOR_BASKET,
     FINGER_THICKNESS, FPS, POWERUP_TYPES, POWERUP_SPAWN_CHANCE,
     NEGATIVE_BALL_CHANCE, MULTI_BALL_CHANCE, MAX_BALLS_AT_ONCE, 
-    BALL_SPAWN_DELAY, POWERUP_DURATION
+    BALL_SPAWN_DELAY, POWERUP_DURATION,
+    PHYSICS_ITERATIONS, PHYSICS_SUBSTEPS, PHYSICS_MAX_STEPS_PER_FRAME, PHYSICS_THREADS,
+    PARTY_MAX_BALLS, PARTY_SPAWN_BURST, PARTY_SPAWN_DELAY, PARTY_HASH_CELL_SIZE, PARTY_HASH_COUNT
 )
 from core.hand_data import HandModel
+from core.game_clock import GameClock
+from core.event_scheduler import EventScheduler
 from typing import Tuple, Optional, List
 
+# Các shape của tay cùng group -> không va chạm lẫn nhau
+HAND_SHAPE_FILTER = pymunk.ShapeFilter(group=1)
+_IDENTITY = pymunk.Transform.identity()
+
+# Loại va chạm (collision_type) cho bóng và các vùng cảm biến
+COLLISION_BALL = 1
+COLLISION_BASKET_SENSOR = 2
+COLLISION_OUT_SENSOR = 3
+
+# Trạng thái bóng trong sự kiện
+BALL_SCORED = 1
+BALL_MISSED = -1
+
 class Ball:
     """Class đại diện cho một quả bóng"""
     def __init__(self, body, shape, ball_type='normal', powerup_type=None):
@@ -20,29 +37,80 @@ class Ball:
         self.shape = shape
         self.ball_type = ball_type  # 'normal', 'powerup', 'negative'
         self.powerup_type = powerup_type
+        self.resolved = False       # Đã vào rổ/ra ngoài (chờ gỡ khỏi space)
+        self.index = -1             # Vị trí trong PhysicsManager.balls (-1: không còn trên sân)
+        shape.ball = self
+
+    def reset(self, x, ball_type, powerup_type):
+        """Dùng lại bóng từ pool: đặt lại vị trí, vận tốc và loại bóng"""
+        body = self.body
+        body.position = (x, -50)
+        body.velocity = (0, 0)
+        body.angular_velocity = 0
+        body.angle = 0
+        body.force = (0, 0)
+        body.torque = 0
+        self.ball_type = ball_type
+        self.powerup_type = powerup_type
+        self.resolved = False
 
 class PhysicsManager:
-    def __init__(self):
-        self.space = pymunk.Space()
+    def __init__(self, clock=None, scheduler=None, substeps=PHYSICS_SUBSTEPS, iterations=PHYSICS_ITERATIONS,
+                 party_mode=False, threads=PHYSICS_THREADS):
+        # Bộ giải đa luồng của pymunk không có trên Windows
+        threaded = threads > 1 and sys.platform != 'win32'
+        self.space = pymunk.Space(threaded=threaded)
+        if threaded:
+            self.space.threads = threads
+        
+        # Đồng hồ game + bộ hẹn giờ dùng chung;
+        # không truyền vào -> tự tạo và tự chạy theo bước vật lý
+        self.owns_clock = clock is None
+        self.clock = clock if clock is not None else GameClock()
+        self.owns_scheduler = scheduler is None
+        self.scheduler = scheduler if scheduler is not None else EventScheduler(self.clock)
         self.space.gravity = (0, GRAVITY)
+        self.space.iterations = iterations
+        
+        # --- BƯỚC THỜI GIAN CỐ ĐỊNH ---
+        self.fixed_dt = 1.0 / (FPS * substeps)
+        self.max_steps_per_frame = PHYSICS_MAX_STEPS_PER_FRAME
+        self.accumulator = 0.0
+        self.dropped_time = 0.0  # Thời gian bị bỏ do chạm giới hạn số bước
         
         # --- QUẢN LÝ NHIỀU BÓNG ---
-        self.balls = []  # Danh sách các Ball objects
-        self.spawn_queue = []  # Hàng đợi spawn bóng
+        self.balls = []  # Danh sách các Ball objects (gỡ O(1) bằng hoán đổi với phần tử cuối)
+        self.ball_pool = []  # Bóng đã gỡ khỏi space, chờ dùng lại
+        self.balls_created = 0  # Tổng số bóng đã cấp phát (để benchmark)
+        self.spawn_events = set()  # id sự kiện spawn bóng đang chờ trong scheduler
         self.last_spawn_time = 0
         
-        # --- RỔ HỨNG BÓNG ---
+        # --- RỔ HỨNG BÓNG + CẢM BIẾN GHI ĐIỂM / RA NGOÀI ---
+        self.ball_events = []      # (status, ball_type, powerup_type) chờ main xử lý
+        self.resolved_balls = []   # Bóng đã có kết quả, gỡ sau space.step()
         self.create_basket()
+        self.create_sensors()
+        
+        # --- CHẾ ĐỘ TIỆC: hàng trăm bóng cùng lúc ---
+        self.party_mode = party_mode
+        if party_mode:
+            # Bóng cùng cỡ, phân bố đều -> spatial hash nhanh hơn cây BB mặc định
+            self.space.use_spatial_hash(PARTY_HASH_CELL_SIZE, PARTY_HASH_COUNT)
 
         # --- TAY ---
         self.hand_body = pymunk.Body(body_type=pymunk.Body.KINEMATIC)
         self.space.add(self.hand_body)
-        self.hand_shapes = [] 
+        self.hand_shapes = []   # Tất cả shape của tay (phẳng)
+        self.hand_slots = []    # Mỗi bàn tay: (poly, [segments])
+        self.hand_shapes_created = 0  # Tổng số shape tay đã cấp phát (để benchmark)
         self.prev_center = None
+        self.prev_hand_time = 0.0
         
         # --- MAGNET POWER-UP ---
         self.magnet_active = False
         self.magnet_strength = 500
+        self.magnet_center = (BASKET_X + BASKET_WIDTH // 2, BASKET_Y + BASKET_HEIGHT // 2)
+        self._magnet_velocity_func = self._magnet_velocity  # Giữ 1 bound method cho mọi bóng
 
     def create_basket(self):
         """Tạo 3 bức tường tĩnh làm thành cái rổ"""
@@ -66,18 +134,74 @@ class PhysicsManager:
             
         self.basket_body = body
 
+    def create_sensors(self):
+        """
+        Cảm biến (sensor) thay cho việc quét vị trí từng bóng mỗi khung:
+        - Lòng rổ: tâm bóng lọt vào giữa rổ (dưới vành một bán kính)
+        - Ngoài biên: trái / phải / dưới màn hình, lùi ra một bán kính
+        Va chạm được báo ngay trong space.step() nên bóng nhanh cũng không bị sót.
+        """
+        r = BALL_RADIUS
+        far = 10 * max(WIDTH, HEIGHT)
+        
+        # Cảm biến chạm khi tâm bóng cách hộp < r -> lùi hộp thêm r
+        basket = pymunk.Poly.create_box_bb(
+            self.basket_body, pymunk.BB(BASKET_X, BASKET_Y + 2 * r, BASKET_X + BASKET_WIDTH, BASKET_Y + BASKET_HEIGHT))
+        basket.collision_type = COLLISION_BASKET_SENSOR
+        
+        static = self.space.static_body
+        out_zones = [
+            pymunk.Poly.create_box_bb(static, pymunk.BB(-far, -far, -2 * r, far)),               # trái
+            pymunk.Poly.create_box_bb(static, pymunk.BB(WIDTH + 2 * r, -far, far, far)),         # phải
+            pymunk.Poly.create_box_bb(static, pymunk.BB(-far, HEIGHT + 2 * r, far, far)),        # dưới
+        ]
+        for zone in out_zones:
+            zone.collision_type = COLLISION_OUT_SENSOR
+        
+        sensors = [basket] + out_zones
+        for shape in sensors:
+            shape.sensor = True
+        self.space.add(*sensors)
+        
+        self._on_ball_begin(COLLISION_BASKET_SENSOR, BALL_SCORED)
+        self._on_ball_begin(COLLISION_OUT_SENSOR, BALL_MISSED)
+
+    def _on_ball_begin(self, sensor_type, status):
+        """Đăng ký callback khi bóng bắt đầu chạm cảm biến (hỗ trợ pymunk 6 và 7)"""
+        def resolve(arbiter):
+            ball = arbiter.shapes[0].ball
+            if not ball.resolved:
+                ball.resolved = True
+                self.ball_events.append((status, ball.ball_type, ball.powerup_type))
+                self.resolved_balls.append(ball)
+        
+        if hasattr(self.space, 'on_collision'):   # pymunk >= 7
+            self.space.on_collision(COLLISION_BALL, sensor_type,
+                                    begin=lambda arbiter, space, data: resolve(arbiter))
+        else:
+            def begin(arbiter, space, data):
+                resolve(arbiter)
+                return True
+            self.space.add_collision_handler(COLLISION_BALL, sensor_type).begin = begin
+
     def spawn_ball(self, force_powerup=False, force_negative=False):
         """Tạo bóng mới - có thể spawn nhiều bóng"""
-        current_time = time.time()
+        current_time = self.clock.now()
         
         # Xác định số lượng bóng sẽ spawn
-        num_balls = 1
-        if random.random() < MULTI_BALL_CHANCE:
-            num_balls = random.randint(2, MAX_BALLS_AT_ONCE)
+        if self.party_mode:
+            free = PARTY_MAX_BALLS - len(self.balls) - len(self.spawn_events)
+            num_balls = max(0, min(PARTY_SPAWN_BURST, free))
+            delay = PARTY_SPAWN_DELAY
+        else:
+            num_balls = 1
+            if random.random() < MULTI_BALL_CHANCE:
+                num_balls = random.randint(2, MAX_BALLS_AT_ONCE)
+            delay = BALL_SPAWN_DELAY
         
-        # Thêm vào hàng đợi spawn
+        # Hẹn giờ spawn từng bóng
         for i in range(num_balls):
-            spawn_time = current_time + (i * BALL_SPAWN_DELAY)
+            spawn_time = current_time + (i * delay)
             
             # Xác định loại bóng
             if force_negative:
@@ -101,164 +225,215 @@ class PhysicsManager:
                 # Bóng thường spawn ngẫu nhiên
                 rand_x = random.randint(100, WIDTH - 100)
             
-            self.spawn_queue.append({
-                'time': spawn_time,
-                'x': rand_x,
-                'type': ball_type,
-                'powerup': powerup_type
-            })
+            event_id = self.scheduler.schedule_at(spawn_time, self._spawn_due, rand_x, ball_type, powerup_type)
+            self.spawn_events.add(event_id)
+
+    def needs_spawn(self):
+        """Có cần spawn đợt bóng mới không (chế độ tiệc: giữ sân luôn đầy bóng)"""
+        if self.party_mode:
+            return len(self.balls) + len(self.spawn_events) < PARTY_MAX_BALLS
+        return len(self.balls) == 0 and not self.spawn_events
+
+    def _spawn_due(self, x, ball_type, powerup_type):
+        """Callback của scheduler khi tới giờ spawn"""
+        self.spawn_events.discard(self.scheduler.current_event)
+        self._create_ball_now(x, ball_type, powerup_type)
 
     def _create_ball_now(self, x, ball_type, powerup_type):
-        """Tạo bóng ngay lập tức"""
-        body = pymunk.Body(1, 100, body_type=pymunk.Body.DYNAMIC)
-        body.position = (x, -50)
-        shape = pymunk.Circle(body, BALL_RADIUS)
-        shape.elasticity = BALL_ELASTICITY
-        shape.friction = BALL_FRICTION
+        """Tạo bóng ngay lập tức (ưu tiên dùng lại bóng trong pool)"""
+        if self.ball_pool:
+            ball = self.ball_pool.pop()
+            ball.reset(x, ball_type, powerup_type)
+        else:
+            body = pymunk.Body(1, 100, body_type=pymunk.Body.DYNAMIC)
+            body.position = (x, -50)
+            shape = pymunk.Circle(body, BALL_RADIUS)
+            shape.elasticity = BALL_ELASTICITY
+            shape.friction = BALL_FRICTION
+            shape.collision_type = COLLISION_BALL
+            ball = Ball(body, shape, ball_type, powerup_type)
+            self.balls_created += 1
         
-        self.space.add(body, shape)
-        ball = Ball(body, shape, ball_type, powerup_type)
+        self._apply_magnet(ball)
+        self.space.add(ball.body, ball.shape)
+        ball.index = len(self.balls)
         self.balls.append(ball)
 
-    def process_spawn_queue(self):
-        """Xử lý hàng đợi spawn bóng"""
-        current_time = time.time()
-        remaining_queue = []
-        
-        for item in self.spawn_queue:
-            if current_time >= item['time']:
-                self._create_ball_now(item['x'], item['type'], item['powerup'])
-            else:
-                remaining_queue.append(item)
-        
-        self.spawn_queue = remaining_queue
-
     def remove_ball(self, ball):
-        """Xóa một bóng cụ thể"""
-        if ball in self.balls:
-            self.space.remove(ball.body, ball.shape)
-            self.balls.remove(ball)
+        """Xóa một bóng cụ thể (O(1): đưa bóng cuối vào chỗ trống) và trả về pool"""
+        index = ball.index
+        if index < 0:
+            return
+        last = self.balls.pop()
+        if last is not ball:
+            self.balls[index] = last
+            last.index = index
+        ball.index = -1
+        self.space.remove(ball.body, ball.shape)
+        self.ball_pool.append(ball)
 
-    def check_balls_status(self) -> List[Tuple[int, str, Optional[str]]]:
+    def pop_ball_events(self) -> List[Tuple[int, str, Optional[str]]]:
         """
-        Kiểm tra trạng thái tất cả các bóng
+        Lấy (và xóa) các sự kiện bóng từ cảm biến kể từ lần gọi trước.
         Returns: List[(status, ball_type, powerup_type)]
-        - status: 1 (vào rổ), -1 (ra ngoài), 0 (đang rơi)
+        - status: BALL_SCORED (1, vào rổ) hoặc BALL_MISSED (-1, ra ngoài)
         """
-        results = []
-        balls_to_remove = []
-        
-        for ball in self.balls:
-            x, y = ball.body.position
-            r = BALL_RADIUS
-
-            # Kiểm tra vào rổ
-            if (BASKET_X < x < BASKET_X + BASKET_WIDTH) and \
-               (BASKET_Y + r < y < BASKET_Y + BASKET_HEIGHT):
-                results.append((1, ball.ball_type, ball.powerup_type))
-                balls_to_remove.append(ball)
-                continue
-
-            # Kiểm tra ra ngoài biên
-            if x < -r or x > WIDTH + r or y > HEIGHT + r:
-                results.append((-1, ball.ball_type, ball.powerup_type))
-                balls_to_remove.append(ball)
-                continue
-        
-        # Xóa các bóng đã xử lý
-        for ball in balls_to_remove:
-            self.remove_ball(ball)
-        
-        return results
+        events = self.ball_events
+        self.ball_events = []
+        return events
 
-    def apply_magnet_force(self):
-        """Áp dụng lực hút nam châm cho TẤT CẢ các bóng"""
-        if not self.magnet_active:
-            return
-        
-        basket_center_x = BASKET_X + BASKET_WIDTH // 2
-        basket_center_y = BASKET_Y + BASKET_HEIGHT // 2
+    def _magnet_velocity(self, body, gravity, damping, dt):
+        """
+        velocity_func của bóng khi nam châm bật: cộng gia tốc hút về tâm rổ
+        (hệ tọa độ thế giới) vào trọng lực, pymunk tự gọi trong space.step().
+        """
+        dx = self.magnet_center[0] - body.position.x
+        dy = self.magnet_center[1] - body.position.y
+        distance = max(1, (dx**2 + dy**2)**0.5)
         
-        for ball in self.balls:
-            # Chỉ hút bóng thường và powerup, không hút bóng trừ điểm
-            if ball.ball_type == 'negative':
-                continue
-                
-            ball_pos = ball.body.position
-            dx = basket_center_x - ball_pos.x
-            dy = basket_center_y - ball_pos.y
-            
-            distance = max(1, (dx**2 + dy**2)**0.5)
-            
-            max_force = 2000
-            force_magnitude = min(self.magnet_strength / (distance * 0.1), max_force)        
-            force_x = (dx / distance) * force_magnitude
-            force_y = (dy / distance) * force_magnitude
-            
-            ball.body.apply_force_at_local_point((force_x, force_y))
+        max_force = 2000
+        force_magnitude = min(self.magnet_strength / (distance * 0.1), max_force)
+        accel = force_magnitude / (distance * body.mass)
+        pymunk.Body.update_velocity(body, (gravity[0] + dx * accel, gravity[1] + dy * accel), damping, dt)
+
+    def _apply_magnet(self, ball):
+        """Gắn/gỡ lực hút cho một bóng (không hút bóng trừ điểm)"""
+        if self.magnet_active and ball.ball_type != 'negative':
+            ball.body.velocity_func = self._magnet_velocity_func
+        else:
+            ball.body.velocity_func = pymunk.Body.update_velocity
+
+    def _add_hand_slot(self):
+        """Tạo bộ shape cho một bàn tay mới xuất hiện (1 Poly lòng bàn tay + các Segment ngón)"""
+        p_radius = FINGER_THICKNESS / 2.0
+
+        # Đỉnh/điểm tạm - sẽ được cập nhật tại chỗ mỗi khung
+        poly = pymunk.Poly(self.hand_body, [(0, 0), (1, 0), (0, 1)])
+        segments = [pymunk.Segment(self.hand_body, (0, 0), (1, 0), p_radius)
+                    for _ in HandModel.CONNECTIONS]
+
+        shapes = [poly] + segments
+        for shape in shapes:
+            shape.elasticity = 0.2
+            shape.friction = 0.8
+            shape.filter = HAND_SHAPE_FILTER
+
+        self.space.add(*shapes)
+        self.hand_shapes.extend(shapes)
+        self.hand_slots.append((poly, segments))
+        self.hand_shapes_created += len(shapes)
 
-    def update_hand_physics(self, hands_landmarks):
-        for shape in self.hand_shapes:
-            self.space.remove(shape)
-        self.hand_shapes.clear()
+    def _remove_hand_slot(self):
+        """Gỡ bộ shape của bàn tay vừa biến mất"""
+        poly, segments = self.hand_slots.pop()
+        shapes = [poly] + segments
+        self.space.remove(*shapes)
+        del self.hand_shapes[-len(shapes):]
+
+    def update_hand_physics(self, hands_landmarks, timestamp=None):
+        """
+        hands_landmarks: mảng (n_hands, 21, 2) tọa độ pixel.
+        timestamp: thời điểm của landmarks (giây) - vận tốc tay tính theo thời gian thật.
+        Shape của mỗi bàn tay được giữ nguyên và chỉ cập nhật hình học tại chỗ;
+        chỉ thêm/gỡ shape khi số bàn tay thay đổi.
+        """
+        n_hands = len(hands_landmarks)
+        while len(self.hand_slots) < n_hands:
+            self._add_hand_slot()
+        while len(self.hand_slots) > n_hands:
+            self._remove_hand_slot()
         
         self.hand_body.position = (0, 0)
         
-        if not hands_landmarks:
+        if n_hands == 0:
             self.hand_body.velocity = (0, 0)
             self.prev_center = None
             return
 
-        all_points = []
-        for points in hands_landmarks:
-            all_points.extend(points.values())
-        
-        if all_points:
-            current_center = np.mean(all_points, axis=0)
-            if self.prev_center is not None:
+        if timestamp is None:
+            timestamp = self.prev_hand_time + 1 / FPS
+
+        current_center = hands_landmarks.reshape(-1, 2).mean(axis=0)
+        if self.prev_center is not None:
+            elapsed = timestamp - self.prev_hand_time
+            if elapsed > 0:
                 dx = current_center[0] - self.prev_center[0]
                 dy = current_center[1] - self.prev_center[1]
-                self.hand_body.velocity = (dx * FPS, dy * FPS)
-            else:
-                self.hand_body.velocity = (0, 0)
-            self.prev_center = current_center
+                self.hand_body.velocity = (dx / elapsed, dy / elapsed)
+            # elapsed == 0: chưa có dữ liệu mới, giữ nguyên vận tốc
+        else:
+            self.hand_body.velocity = (0, 0)
+        self.prev_center = current_center
+        self.prev_hand_time = timestamp
 
-        p_radius = FINGER_THICKNESS / 2.0
+        # Gom điểm một lần cho tất cả bàn tay (vectorized gather)
+        palms = hands_landmarks[:, HandModel.PALM_INDICES_ARRAY].tolist()
+        seg_starts = hands_landmarks[:, HandModel.CONNECTIONS_ARRAY[:, 0]].tolist()
+        seg_ends = hands_landmarks[:, HandModel.CONNECTIONS_ARRAY[:, 1]].tolist()
+
+        for (poly, segments), palm_points, starts, ends in zip(self.hand_slots, palms, seg_starts, seg_ends):
+            # Có transform -> pymunk tính bao lồi + chiều quay (landmarks lòng bàn tay không chắc lồi)
+            poly.unsafe_set_vertices(palm_points, transform=_IDENTITY)
+
+            for segment, p1, p2 in zip(segments, starts, ends):
+                segment.unsafe_set_endpoints(p1, p2)
+
+        # Cập nhật bounding box cho broadphase sau khi đổi hình học
+        self.space.reindex_shapes_for_body(self.hand_body)
+
+    def advance(self, frame_dt):
+        """
+        Tích lũy thời gian khung thật rồi chạy các bước vật lý cố định.
+        Trả về số bước đã chạy trong khung này.
+        """
+        self.accumulator += frame_dt
+        steps = 0
+        while self.accumulator >= self.fixed_dt and steps < self.max_steps_per_frame:
+            self.step(self.fixed_dt)
+            self.accumulator -= self.fixed_dt
+            steps += 1
+        
+        # Máy quá chậm: bỏ phần tồn đọng thay vì dồn sang khung sau (giữ phần lẻ < fixed_dt)
+        if self.accumulator >= self.fixed_dt:
+            leftover = self.accumulator % self.fixed_dt
+            self.dropped_time += self.accumulator - leftover
+            self.accumulator = leftover
+        return steps
 
-        for points in hands_landmarks:
-            palm_points_list = [points[i] for i in HandModel.PALM_INDICES if i in points]
-            if len(palm_points_list) >= 3:
-                try:
-                    poly = pymunk.Poly(self.hand_body, palm_points_list)
-                    poly.elasticity = 0.2
-                    poly.friction = 0.8
-                    poly.filter = pymunk.ShapeFilter(group=1)
-                    self.space.add(poly)
-                    self.hand_shapes.append(poly)
-                except: pass
-
-            for p1_id, p2_id in HandModel.CONNECTIONS:
-                if p1_id in points and p2_id in points:
-                    segment = pymunk.Segment(self.hand_body, points[p1_id], points[p2_id], p_radius)
-                    segment.elasticity = 0.2
-                    segment.friction = 0.8
-                    segment.filter = pymunk.ShapeFilter(group=1)
-                    self.space.add(segment)
-                    self.hand_shapes.append(segment)
+    def clamp_frame_time(self, frame_dt):
+        """
+        Phần thời gian khung mà vật lý thực sự mô phỏng (tối đa max_steps_per_frame bước).
+        Phần bị bỏ tính vào dropped_time - đồng hồ game nên tiến theo giá trị trả về.
+        """
+        budget = max(self.max_steps_per_frame * self.fixed_dt - self.accumulator, 0.0)
+        if frame_dt > budget:
+            self.dropped_time += frame_dt - budget
+            return budget
+        return frame_dt
 
     def step(self, dt):
-        # Xử lý hàng đợi spawn
-        self.process_spawn_queue()
+        if self.owns_clock:
+            self.clock.advance(dt)
         
-        # Áp dụng magnet nếu active
-        if self.magnet_active:
-            self.apply_magnet_force()
+        # Sự kiện hẹn giờ đến hạn (spawn bóng) - khi dùng chung, main tự gọi run_due()
+        if self.owns_scheduler:
+            self.scheduler.run_due()
         
         self.space.step(dt)
+        
+        # Gỡ bóng đã vào rổ/ra ngoài (không được gỡ trong callback va chạm)
+        if self.resolved_balls:
+            for ball in self.resolved_balls:
+                self.remove_ball(ball)
+            self.resolved_balls.clear()
     
     def set_magnet(self, active):
-        """Bật/tắt nam châm"""
+        """Bật/tắt nam châm (chỉ đổi velocity_func của các bóng khi trạng thái thay đổi)"""
+        if active == self.magnet_active:
+            return
         self.magnet_active = active
+        for ball in self.balls:
+            self._apply_magnet(ball)
     
     def get_all_balls(self):
         """Lấy danh sách tất cả các bóng"""
@@ -266,10 +441,21 @@ class PhysicsManager:
     
     def reset(self):
         """Reset game"""
-        for ball in self.balls[:]:
-            self.remove_ball(ball)
-        self.balls.clear()
-        self.spawn_queue.clear()
+        # Gỡ tất cả bóng khỏi space trong một lần gọi
+        if self.balls:
+            shapes = []
+            for ball in self.balls:
+                ball.index = -1
+                shapes += (ball.body, ball.shape)
+            self.space.remove(*shapes)
+            self.ball_pool.extend(self.balls)
+            self.balls.clear()
+        for event_id in self.spawn_events:
+            self.scheduler.cancel(event_id)
+        self.spawn_events.clear()
+        self.ball_events.clear()
+        self.resolved_balls.clear()
+        self.accumulator = 0.0
         self.hand_body.velocity = (0, 0)
         self.prev_center = None
         self.magnet_active = False
\ No newline at end of file
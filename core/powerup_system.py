@@ -1,31 +1,30 @@
 # core/powerup_system.py
-import time
 from settings import POWERUP_DURATION
 
 class PowerUp:
     """Một power-up đơn lẻ"""
-    def __init__(self, powerup_type):
+    def __init__(self, powerup_type, clock):
         self.type = powerup_type
-        self.start_time = time.time()
+        self.clock = clock
+        self.start_time = clock.now()
         self.duration = POWERUP_DURATION
         self.active = True
+        self.expire_event = None  # id sự kiện hết hạn trong EventScheduler
         
     def get_remaining_time(self):
-        elapsed = time.time() - self.start_time
+        elapsed = self.clock.now() - self.start_time
         remaining = self.duration - elapsed
         return max(0, remaining)
     
     def is_expired(self):
         return self.get_remaining_time() <= 0
-    
-    def update(self):
-        if self.is_expired():
-            self.active = False
 
 
 class PowerUpSystem:
     """Quản lý các power-ups đang active"""
-    def __init__(self):
+    def __init__(self, clock, scheduler):
+        self.clock = clock  # GameClock - thời gian game (theo time_scale)
+        self.scheduler = scheduler  # Hẹn giờ hết hạn thay vì kiểm tra mỗi khung
         self.active_powerups = []
         
     def activate(self, powerup_type):
@@ -34,19 +33,20 @@ class PowerUpSystem:
         for pu in self.active_powerups:
             if pu.type == powerup_type:
                 # Reset thời gian
-                pu.start_time = time.time()
+                pu.start_time = self.clock.now()
+                self.scheduler.cancel(pu.expire_event)
+                pu.expire_event = self.scheduler.schedule(pu.duration, self._expire, pu)
                 return
         
         # Thêm power-up mới
-        powerup = PowerUp(powerup_type)
+        powerup = PowerUp(powerup_type, self.clock)
+        powerup.expire_event = self.scheduler.schedule(powerup.duration, self._expire, powerup)
         self.active_powerups.append(powerup)
     
-    def update(self):
-        """Cập nhật và loại bỏ power-ups hết hạn"""
-        for pu in self.active_powerups:
-            pu.update()
-        
-        self.active_powerups = [pu for pu in self.active_powerups if pu.active]
+    def _expire(self, powerup):
+        """Callback của scheduler khi power-up hết hạn"""
+        powerup.active = False
+        self.active_powerups.remove(powerup)
     
     def has_powerup(self, powerup_type):
         """Kiểm tra có power-up này đang active không"""
@@ -64,6 +64,8 @@ class PowerUpSystem:
     
     def clear(self):
         """Xóa tất cả power-ups"""
+        for pu in self.active_powerups:
+            self.scheduler.cancel(pu.expire_event)
         self.active_powerups.clear()
     
     def get_active_list(self):
@@ -1,6 +1,7 @@
 # core/renderer.py
 import pygame
 import math
+import numpy as np
 import time
 import os
 import sys
@@ -9,8 +10,10 @@ from settings import (
     WIDTH, HEIGHT, BALL_RADIUS, BASKET_X, BASKET_Y, BASKET_WIDTH, BASKET_HEIGHT,
     FINGER_THICKNESS, THEMES, BALL_SKINS, POWERUP_TYPES, POWERUP_DURATION,
     COMBO_TIMEOUT, COMBO_MULTIPLIERS, BACKGROUND_IMAGE,
-    NEGATIVE_BALL_COLOR, NEGATIVE_BALL_SYMBOL
+    NEGATIVE_BALL_COLOR, NEGATIVE_BALL_SYMBOL, DIRTY_RECT_RENDERING, TEXT_CACHE_SIZE,
+    BALL_PULSE_PHASES
 )
+from core.text_cache import TextCache
 
 # ===== HÀM XỬ LÝ ĐƯỜNG DẪN CHO PYINSTALLER =====
 def resource_path(relative_path):
@@ -31,14 +34,17 @@ class GameRenderer:
         self.screen = screen
         self.width = screen.get_width()
         self.height = screen.get_height()
-        self.hand_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        # Lớp bóng tay: chỉ lớn bằng vùng bao các bàn tay, dùng lại giữa các khung
+        self.hand_surface = pygame.Surface((1, 1), pygame.SRCALPHA)
+        self.pending_hands = []       # (landmarks, hand_model, style) chờ vẽ ở apply_shadow_effect
         
         # --- LOAD ẢNH NỀN (ĐÃ SỬA) ---
         self.background = None
+        self.background_source = None   # Ảnh gốc (để scale lại khi đổi kích thước)
         try:
             bg_path = resource_path(BACKGROUND_IMAGE)
-            bg_img = pygame.image.load(bg_path)
-            self.background = pygame.transform.scale(bg_img, (self.width, self.height))
+            self.background_source = pygame.image.load(bg_path)
+            self.background = self._scale_background()
             print(f"✅ Đã load ảnh nền: {BACKGROUND_IMAGE}")
         except Exception as e:
             print(f"⚠️ Không thể load ảnh nền '{BACKGROUND_IMAGE}': {e}")
@@ -61,94 +67,239 @@ class GameRenderer:
             self.font_small = pygame.font.SysFont("Verdana", 25)
             self.font_tiny = pygame.font.SysFont("Verdana", 18)
         
+        # Cache chữ đã render (HUD, nút, biểu tượng bóng, hint)
+        self.text_cache = TextCache(TEXT_CACHE_SIZE)
+        
         # Chỉ dùng theme mặc định
         self.current_theme = THEMES['default']
         self.current_skin = BALL_SKINS['default']
+        
+        # --- DIRTY RECT: chỉ khôi phục nền + cập nhật màn hình ở vùng thay đổi ---
+        self.dirty_mode = DIRTY_RECT_RENDERING
+        self.full_redraw = True       # Khung hiện tại vẽ lại toàn bộ
+        self.dirty_rects = []         # Vùng đã vẽ trong khung này
+        self.prev_dirty_rects = []    # Vùng đã vẽ ở khung trước (cần xóa)
+        
+        # --- LỚP TĨNH: nền + rổ dựng sẵn một lần, đúng định dạng pixel của màn hình ---
+        self.static_layers = {}       # with_basket -> Surface
+        self.static_theme = None      # Theme / kích thước lúc dựng lớp tĩnh
+        self.static_size = None
+        
+        # --- ATLAS BÓNG: sprite dựng sẵn cho từng loại bóng x pha nhấp nháy ---
+        self.ball_sprites = {}        # (ball_type, powerup_type) -> [(sprite, offset), ...]
+        self.ball_sprites_skin = None
+        self._build_ball_atlas()
+
+    def _scale_background(self):
+        """Scale ảnh nền theo màn hình và convert() sang định dạng pixel của màn hình"""
+        return pygame.transform.scale(self.background_source, (self.width, self.height)).convert()
+
+    def set_theme(self, name):
+        """Đổi theme (lớp tĩnh sẽ được dựng lại ở khung sau)"""
+        self.current_theme = THEMES[name]
+
+    def get_static_layer(self, with_basket=True):
+        """Lớp nền tĩnh (ảnh nền/màu nền + rổ), chỉ dựng lại khi đổi theme hoặc kích thước"""
+        size = self.screen.get_size()
+        if self.static_theme is not self.current_theme or self.static_size != size:
+            if size != (self.width, self.height):
+                self.width, self.height = size
+                if self.background_source:
+                    self.background = self._scale_background()
+            self.static_layers.clear()
+            self.static_theme = self.current_theme
+            self.static_size = size
+            self.full_redraw = True
+        
+        layer = self.static_layers.get(with_basket)
+        if layer is None:
+            layer = pygame.Surface(size, 0, self.screen)
+            if self.background:
+                layer.blit(self.background, (0, 0))
+            else:
+                layer.fill(self.current_theme['bg'])
+            if with_basket:
+                self.draw_basket(layer)
+            self.static_layers[with_basket] = layer
+        return layer
+
+    def mark_dirty(self, rect):
+        """Ghi nhận vùng vừa vẽ lên màn hình (None = không vẽ gì)"""
+        if rect:
+            self.dirty_rects.append(rect)
+        return rect
+
+    def clear_screen(self, full_redraw=False, with_basket=True):
+        """
+        Vẽ nền (ảnh/màu + rổ) từ lớp tĩnh dựng sẵn.
+        Chế độ dirty rect: chỉ khôi phục nền ở các vùng đã vẽ khung trước,
+        trừ khi full_redraw (đổi trạng thái, màn hình có lớp phủ toàn màn hình).
+        """
+        layer = self.get_static_layer(with_basket)
+        self.full_redraw = full_redraw or not self.dirty_mode or self.full_redraw
+        if self.full_redraw:
+            self.screen.blit(layer, (0, 0))
+        else:
+            for rect in self.prev_dirty_rects:
+                self.screen.blit(layer, rect, rect)
+        
+        self.dirty_rects = []
+        self.pending_hands.clear()
 
-    def clear_screen(self):
-        """Vẽ nền - ưu tiên ảnh, fallback về màu"""
-        if self.background:
-            self.screen.blit(self.background, (0, 0))
+    def present(self):
+        """Đưa khung lên màn hình: toàn bộ hoặc chỉ các vùng thay đổi"""
+        if self.full_redraw:
+            pygame.display.update()
         else:
-            self.screen.fill(self.current_theme['bg'])
+            pygame.display.update(self.prev_dirty_rects + self.dirty_rects)
         
-        self.hand_surface.fill((0, 0, 0, 0))
+        self.prev_dirty_rects = self.dirty_rects
+        self.full_redraw = False
 
     def draw_organic_hand(self, landmarks, hand_model, style):
+        """landmarks: mảng (21, 2) tọa độ pixel của một bàn tay (vẽ ở apply_shadow_effect)"""
+        self.pending_hands.append((landmarks, hand_model, style))
+
+    def _hand_bounds(self, landmarks, thickness):
+        """Vùng bao bàn tay (cộng nửa độ dày ngón), cắt theo màn hình"""
+        pad = thickness // 2 + 2
+        x_min, y_min = landmarks.min(axis=0).tolist()
+        x_max, y_max = landmarks.max(axis=0).tolist()
+        rect = pygame.Rect(int(x_min) - pad, int(y_min) - pad,
+                           int(x_max - x_min) + 2 * pad + 1, int(y_max - y_min) + 2 * pad + 1)
+        return rect.clip(self.screen.get_rect())
+
+    def _rasterize_hand(self, surface, landmarks, hand_model, style):
         color = style["color"]
         thickness = style["finger_thickness"]
 
-        webbing_groups = [[0, 5, 9], [0, 9, 13], [0, 13, 17]]
-        for group in webbing_groups:
-            points = [landmarks[i] for i in group if i in landmarks]
-            if len(points) == 3:
-                pygame.draw.polygon(self.hand_surface, color, points)
+        for points in landmarks[hand_model.WEBBING_GROUPS_ARRAY].tolist():
+            pygame.draw.polygon(surface, color, points)
 
-        palm_points = [landmarks[i] for i in hand_model.PALM_INDICES if i in landmarks]
-        if len(palm_points) >= 3:
-            pygame.draw.polygon(self.hand_surface, color, palm_points)
+        pygame.draw.polygon(surface, color, landmarks[hand_model.PALM_INDICES_ARRAY].tolist())
 
-        for point in landmarks.values():
-            pygame.draw.circle(self.hand_surface, color, point, int(thickness * 0.5))
+        joint_radius = int(thickness * 0.5)
+        for point in landmarks.tolist():
+            pygame.draw.circle(surface, color, point, joint_radius)
 
-        for p1_id, p2_id in hand_model.CONNECTIONS:
-            if p1_id in landmarks and p2_id in landmarks:
-                pygame.draw.line(self.hand_surface, color, landmarks[p1_id], landmarks[p2_id], thickness)
+        starts = landmarks[hand_model.CONNECTIONS_ARRAY[:, 0]].tolist()
+        ends = landmarks[hand_model.CONNECTIONS_ARRAY[:, 1]].tolist()
+        for p1, p2 in zip(starts, ends):
+            pygame.draw.line(surface, color, p1, p2, thickness)
 
     def apply_shadow_effect(self):
-        self.screen.blit(self.hand_surface, (0, 0))
+        """
+        Vẽ bóng các bàn tay: mỗi nhóm tay chồng lên nhau được vẽ vào lớp nhỏ
+        (kích thước vùng bao) rồi blit một lần -> chi phí theo cỡ tay, không theo độ phân giải.
+        """
+        # Gom các tay có vùng bao giao nhau (tay chồng nhau không bị tô đậm 2 lần)
+        groups = []
+        for hand in self.pending_hands:
+            rect = self._hand_bounds(hand[0], hand[2]["finger_thickness"])
+            if not rect:
+                continue
+            members = [hand]
+            for group in groups[:]:
+                if group[0].colliderect(rect):
+                    rect = rect.union(group[0])
+                    members += group[1]
+                    groups.remove(group)
+            groups.append((rect, members))
+        self.pending_hands.clear()
+
+        for rect, members in groups:
+            # Lớp tay dùng lại, chỉ cấp phát lại khi cần lớn hơn
+            if rect.w > self.hand_surface.get_width() or rect.h > self.hand_surface.get_height():
+                self.hand_surface = pygame.Surface(
+                    (max(rect.w, self.hand_surface.get_width()), max(rect.h, self.hand_surface.get_height())),
+                    pygame.SRCALPHA)
+            area = pygame.Rect(0, 0, rect.w, rect.h)
+            self.hand_surface.fill((0, 0, 0, 0), area)
+            
+            origin = np.array(rect.topleft, dtype=np.float32)
+            for landmarks, hand_model, style in members:
+                self._rasterize_hand(self.hand_surface, landmarks - origin, hand_model, style)
+            self.mark_dirty(self.screen.blit(self.hand_surface, rect, area))
+
+    def _render_ball_sprite(self, base_color, symbol=None):
+        """Dựng 1 sprite bóng: nền + bóng đổ + biểu tượng. Trả về (sprite, offset tới tâm)"""
+        radius = BALL_RADIUS
+        sym_surf = self.font_small.render(symbol, True, (255, 255, 255)) if symbol else None
+        
+        # Nửa kích thước đủ chứa bóng, bóng đổ (lệch 3px) và biểu tượng
+        half_w = radius + 4
+        half_h = radius + 4
+        if sym_surf:
+            half_w = max(half_w, sym_surf.get_width() // 2 + 1)
+            half_h = max(half_h, sym_surf.get_height() // 2 + 1)
+        
+        sprite = pygame.Surface((half_w * 2, half_h * 2), pygame.SRCALPHA)
+        center = (half_w, half_h)
+        pygame.draw.circle(sprite, base_color, center, radius)
+        # Bóng đổ: màn hình không có kênh alpha nên bản gốc vẽ ra màu đen đặc
+        pygame.draw.circle(sprite, (0, 0, 0), (center[0] + 3, center[1] + 3), radius)
+        if sym_surf:
+            sprite.blit(sym_surf, sym_surf.get_rect(center=center))
+        return sprite.convert_alpha(), (-half_w, -half_h)
+
+    def _build_ball_atlas(self):
+        """Dựng sprite cho bóng thường, bóng trừ điểm và từng power-up (BALL_PULSE_PHASES pha)"""
+        self.ball_sprites.clear()
+        self.ball_sprites_skin = self.current_skin
+        phases = [math.sin(2 * math.pi * k / BALL_PULSE_PHASES) for k in range(BALL_PULSE_PHASES)]
+        
+        self.ball_sprites[('normal', None)] = [
+            self._render_ball_sprite(self.current_skin.get('color', (200, 50, 50)))
+        ]
+        
+        # Bóng trừ điểm - nhấp nháy đỏ
+        self.ball_sprites[('negative', None)] = [
+            self._render_ball_sprite(
+                tuple(int(c + (s + 1) / 2 * 100) for c in NEGATIVE_BALL_COLOR), NEGATIVE_BALL_SYMBOL)
+            for s in phases
+        ]
+        
+        for ptype, pinfo in POWERUP_TYPES.items():
+            self.ball_sprites[('powerup', ptype)] = [
+                self._render_ball_sprite(
+                    tuple(min(255, int(c + (s + 1) / 2 * 50)) for c in pinfo['color']), pinfo['symbol'])
+                for s in phases
+            ]
 
     def draw_ball(self, ball_obj):
-        """Vẽ bóng - hỗ trợ cả bóng trừ điểm"""
+        """Vẽ bóng - hỗ trợ cả bóng trừ điểm (1 lần blit sprite theo pha nhấp nháy)"""
         if not ball_obj or not ball_obj.body:
             return
+        if self.ball_sprites_skin is not self.current_skin:
+            self._build_ball_atlas()
             
-        pos = (int(ball_obj.body.position.x), int(ball_obj.body.position.y))
-        angle = ball_obj.body.angle
-        radius = BALL_RADIUS
-        
         ball_type = ball_obj.ball_type
         powerup_type = ball_obj.powerup_type
         
-        # 1. Xác định màu nền bóng
         if ball_type == 'negative':
-            # BÓNG TRỪ ĐIỂM - Màu đen
-            base_color = NEGATIVE_BALL_COLOR
-            # Hiệu ứng nhấp nháy đỏ
-            pulse = (math.sin(time.time() * 8) + 1) / 2
-            base_color = tuple(int(c + pulse * 100) for c in base_color)
-            
+            frames = self.ball_sprites[('negative', None)]
+            speed = 8
         elif ball_type == 'powerup' and powerup_type:
-            base_color = POWERUP_TYPES[powerup_type]['color']
-            pulse = (math.sin(time.time() * 10) + 1) / 2
-            base_color = tuple(min(255, int(c + pulse * 50)) for c in base_color)
+            frames = self.ball_sprites[('powerup', powerup_type)]
+            speed = 10
         else:
-            # Bóng thường
-            base_color = self.current_skin.get('color', (200, 50, 50))
-
-        # 2. Vẽ nền bóng
-        pygame.draw.circle(self.screen, base_color, pos, radius)
-
-        # 3. Bóng đổ nhẹ
-        pygame.draw.circle(self.screen, (0, 0, 0, 40), (pos[0] + 3, pos[1] + 3), radius)
+            frames = self.ball_sprites[('normal', None)]
+            speed = 0
         
-        # 4. Vẽ biểu tượng
-        if ball_type == 'negative':
-            # Biểu tượng bóng trừ điểm
-            symbol = NEGATIVE_BALL_SYMBOL
-            sym_surf = self.font_small.render(symbol, True, (255, 255, 255))
-            sym_rect = sym_surf.get_rect(center=pos)
-            self.screen.blit(sym_surf, sym_rect)
-            
-        elif ball_type == 'powerup' and powerup_type:
-            # Icon Powerup
-            symbol = POWERUP_TYPES[powerup_type]['symbol']
-            sym_surf = self.font_small.render(symbol, True, (255, 255, 255))
-            sym_rect = sym_surf.get_rect(center=pos)
-            self.screen.blit(sym_surf, sym_rect)
-
-    def draw_basket(self):
-        """Vẽ cái rổ"""
+        # Pha nhấp nháy lượng tử hóa: sin(t * speed) -> chỉ số sprite
+        if speed:
+            phase = int(time.time() * speed / (2 * math.pi) * BALL_PULSE_PHASES + 0.5) % BALL_PULSE_PHASES
+        else:
+            phase = 0
+        sprite, (ox, oy) = frames[phase]
+        
+        pos = ball_obj.body.position
+        self.mark_dirty(self.screen.blit(sprite, (int(pos.x) + ox, int(pos.y) + oy)))
+
+    def draw_basket(self, surface=None):
+        """Vẽ cái rổ (mặc định lên màn hình; lớp tĩnh gọi với surface riêng)"""
+        if surface is None:
+            surface = self.screen
         color = self.current_theme['basket']
         darker_color = (max(0, color[0]-30), max(0, color[1]-30), max(0, color[2]-30))
         
@@ -167,8 +318,8 @@ class GameRenderer:
         ]
         
         s = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        pygame.draw.polygon(s, (*color, 100), points)
-        self.screen.blit(s, (0,0))
+        net_rect = pygame.draw.polygon(s, (*color, 100), points)
+        surface.blit(s, net_rect, net_rect)
         
         # Dây lưới dọc
         lines_count = 6
@@ -176,7 +327,7 @@ class GameRenderer:
             t = i / lines_count
             top_p = (bx + bw * t, by)
             bot_p = (bottom_x + bottom_w * t, by + bh)
-            pygame.draw.line(self.screen, (200, 200, 200), top_p, bot_p, 2)
+            net_rect.union_ip(pygame.draw.line(surface, (200, 200, 200), top_p, bot_p, 2))
             
         # Dây ngang
         for i in range(1, 4):
@@ -184,10 +335,12 @@ class GameRenderer:
             t = i / 4
             xl = bx + (bottom_x - bx) * t
             xr = (bx + bw) + ((bottom_x + bottom_w) - (bx + bw)) * t
-            pygame.draw.line(self.screen, (200, 200, 200), (xl, y), (xr, y), 2)
+            net_rect.union_ip(pygame.draw.line(surface, (200, 200, 200), (xl, y), (xr, y), 2))
 
         # 2. Vẽ vành rổ (Rim)
-        pygame.draw.rect(self.screen, darker_color, (bx - 5, by, bw + 10, 10), border_radius=5)
+        net_rect.union_ip(pygame.draw.rect(surface, darker_color, (bx - 5, by, bw + 10, 10), border_radius=5))
+        if surface is self.screen:
+            self.mark_dirty(net_rect)
 
     def draw_button(self, text, rect, base_color, hover=False):
         """Vẽ nút bấm"""
@@ -204,14 +357,16 @@ class GameRenderer:
         pygame.draw.rect(self.screen, color, draw_rect, border_radius=15)
         pygame.draw.rect(self.screen, (255, 255, 255), draw_rect, 3, border_radius=15)
         
-        text_surf = self.font_medium.render(text, True, (255, 255, 255))
-        text_shadow = self.font_medium.render(text, True, (0, 0, 0, 50))
+        text_surf = self.text_cache.render(self.font_medium, text, (255, 255, 255))
+        text_shadow = self.text_cache.render(self.font_medium, text, (0, 0, 0, 50))
         
         center_x = draw_rect.centerx - text_surf.get_width() // 2
         center_y = draw_rect.centery - text_surf.get_height() // 2
         
-        self.screen.blit(text_shadow, (center_x + 2, center_y + 2))
-        self.screen.blit(text_surf, (center_x, center_y))
+        self.mark_dirty(draw_rect.union(shadow_rect).unionall([
+            self.screen.blit(text_shadow, (center_x + 2, center_y + 2)),
+            self.screen.blit(text_surf, (center_x, center_y)),
+        ]))
 
     def draw_hud(self, score, time_left, combo_system, powerup_system):
         """Vẽ bảng điểm"""
@@ -221,12 +376,10 @@ class GameRenderer:
         val_score = str(score)
         val_time = f"{int(time_left)}s"
         
-        surf_lbl_score = self.font_tiny.render(lbl_score, True, (100, 100, 100))
-        surf_val_score = self.font_medium.render(val_score, True, self.current_theme['text'])
-        
-        surf_lbl_time = self.font_tiny.render(lbl_time, True, (100, 100, 100))
+        cache = self.text_cache
+        surf_lbl_score = cache.render(self.font_tiny, lbl_score, (100, 100, 100))
+        surf_lbl_time = cache.render(self.font_tiny, lbl_time, (100, 100, 100))
         color_time = (220, 50, 50) if time_left < 10 else self.current_theme['text']
-        surf_val_time = self.font_medium.render(val_time, True, color_time)
         
         box_w = 150
         box_h = 80
@@ -241,11 +394,15 @@ class GameRenderer:
         pygame.draw.rect(self.screen, self.current_theme['ui_bg'], rect_score, border_radius=15)
         pygame.draw.rect(self.screen, self.current_theme['ui_bg'], rect_time, border_radius=15)
         
-        self.screen.blit(surf_lbl_score, (rect_score.centerx - surf_lbl_score.get_width()//2, rect_score.y + 10))
-        self.screen.blit(surf_val_score, (rect_score.centerx - surf_val_score.get_width()//2, rect_score.y + 35))
-        
-        self.screen.blit(surf_lbl_time, (rect_time.centerx - surf_lbl_time.get_width()//2, rect_time.y + 10))
-        self.screen.blit(surf_val_time, (rect_time.centerx - surf_val_time.get_width()//2, rect_time.y + 35))
+        hud_rect = rect_score.union(rect_time).unionall([
+            self.screen.blit(surf_lbl_score, (rect_score.centerx - surf_lbl_score.get_width()//2, rect_score.y + 10)),
+            cache.blit_number(self.screen, self.font_medium, val_score, self.current_theme['text'],
+                              rect_score.centerx, rect_score.y + 35),
+            self.screen.blit(surf_lbl_time, (rect_time.centerx - surf_lbl_time.get_width()//2, rect_time.y + 10)),
+            cache.blit_number(self.screen, self.font_medium, val_time, color_time,
+                              rect_time.centerx, rect_time.y + 35),
+        ])
+        self.mark_dirty(hud_rect)
 
         # Combo
         if combo_system.should_show_combo():
@@ -253,13 +410,13 @@ class GameRenderer:
             txt = f"COMBO x{combo_system.combo_count}!"
             col_combo = (255, 150, 0)
             
-            surf_combo = self.font_large.render(txt, True, col_combo)
+            surf_combo = cache.render(self.font_large, txt, col_combo)
             w = int(surf_combo.get_width() * scale)
             h = int(surf_combo.get_height() * scale)
             if w > 0 and h > 0:
                 surf_combo = pygame.transform.scale(surf_combo, (w, h))
             
-            self.screen.blit(surf_combo, (self.width//2 - surf_combo.get_width()//2, 150))
+            self.mark_dirty(self.screen.blit(surf_combo, (self.width//2 - surf_combo.get_width()//2, 150)))
 
         # Power-up Icons
         active_pus = powerup_system.get_active_list()
@@ -269,11 +426,11 @@ class GameRenderer:
             py = 150 + i * 70
             
             pct = remain / POWERUP_DURATION
-            pygame.draw.circle(self.screen, pinfo['color'], (px, py), 25)
+            self.mark_dirty(pygame.draw.circle(self.screen, pinfo['color'], (px, py), 25).inflate(2, 2))
             pygame.draw.arc(self.screen, (255, 255, 255), (px-25, py-25, 50, 50), 0, pct * 2 * math.pi, 3)
             
-            sym = self.font_small.render(pinfo['symbol'], True, (255, 255, 255))
-            self.screen.blit(sym, (px - sym.get_width()//2, py - sym.get_height()//2))
+            sym = cache.render(self.font_small, pinfo['symbol'], (255, 255, 255))
+            self.mark_dirty(self.screen.blit(sym, (px - sym.get_width()//2, py - sym.get_height()//2)))
 
     def draw_menu_simple(self):
         """Menu đơn giản - chỉ có ảnh nền và nút bấm"""
@@ -353,7 +510,7 @@ class GameRenderer:
 
     def draw_hint(self, hint_text):
         """Vẽ hint ở dưới cùng màn hình"""
-        hint_surf = self.font_small.render(hint_text, True, (255, 255, 255))
+        hint_surf = self.text_cache.render(self.font_small, hint_text, (255, 255, 255))
         
         hint_width = hint_surf.get_width() + 30
         hint_height = hint_surf.get_height() + 15
@@ -364,6 +521,6 @@ class GameRenderer:
         
         s = pygame.Surface((hint_width, hint_height), pygame.SRCALPHA)
         pygame.draw.rect(s, (50, 50, 50, 200), s.get_rect(), border_radius=10)
-        self.screen.blit(s, (hint_x, hint_y))
+        self.mark_dirty(self.screen.blit(s, (hint_x, hint_y)))
         
-        self.screen.blit(hint_surf, (hint_x + 15, hint_y + 7))
\ No newline at end of file
+        self.mark_dirty(self.screen.blit(hint_surf, (hint_x + 15, hint_y + 7)))
\ No newline at end of file
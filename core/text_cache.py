@@ -0,0 +1,51 @@
+# core/text_cache.py
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    """
+    Cache LRU cho chữ đã render (font.render rất chậm so với blit).
+    - Khóa: (font, text, color), giữ tối đa `capacity` surface
+    - Số (điểm, thời gian) ghép từ glyph từng chữ số -> chỉ cần ~10 glyph cho mọi giá trị
+    """
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, True, color)
+        self.surfaces[key] = surf
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return surf
+
+    def blit_number(self, dest, font, text, color, center_x, y):
+        """Vẽ chuỗi số (căn giữa theo center_x) bằng glyph từng ký tự, trả về Rect đã vẽ"""
+        glyphs = [self.render(font, ch, color) for ch in text]
+        width = sum(g.get_width() for g in glyphs)
+        x = center_x - width // 2
+        rect = pygame.Rect(x, y, 0, 0)
+        for glyph in glyphs:
+            rect.union_ip(dest.blit(glyph, (x, y)))
+            x += glyph.get_width()
+        return rect
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        self.surfaces.clear()
@@ -3,11 +3,12 @@ import pygame
 
 class TutorialSystem:
     """Hệ thống hướng dẫn và hints"""
-    def __init__(self):
+    def __init__(self, scheduler):
+        self.scheduler = scheduler  # Hẹn giờ ẩn hint
         self.first_time = True
         self.show_tutorial = False
         self.current_hint = ""
-        self.hint_timer = 0
+        self.hint_event = None
         self.miss_count = 0
         
         # Các tips ngẫu nhiên (CẬP NHẬT)
@@ -84,7 +85,12 @@ class TutorialSystem:
     def show_hint(self, hint_text, duration=3.0):
         """Hiển thị hint tạm thời"""
         self.current_hint = hint_text
-        self.hint_timer = duration
+        self.scheduler.cancel(self.hint_event)
+        self.hint_event = self.scheduler.schedule(duration, self._hide_hint)
+    
+    def _hide_hint(self):
+        self.current_hint = ""
+        self.hint_event = None
     
     def on_miss(self):
         """Gọi khi người chơi bỏ lỡ bóng"""
@@ -99,13 +105,6 @@ class TutorialSystem:
         """Reset miss count khi ghi điểm"""
         self.miss_count = 0
     
-    def update(self, dt):
-        """Update hint timer"""
-        if self.hint_timer > 0:
-            self.hint_timer -= dt
-            if self.hint_timer <= 0:
-                self.current_hint = ""
-    
     def get_current_step(self):
         """Lấy bước tutorial hiện tại"""
         if 0 <= self.current_step < len(self.tutorial_steps):
@@ -114,10 +113,10 @@ class TutorialSystem:
     
     def should_show_hint(self):
         """Có nên hiện hint không"""
-        return self.hint_timer > 0 and self.current_hint != ""
+        return self.current_hint != ""
     
     def reset_game_stats(self):
         """Reset stats khi bắt đầu game mới"""
         self.miss_count = 0
-        self.current_hint = ""
-        self.hint_timer = 0
\ No newline at end of file
+        self.scheduler.cancel(self.hint_event)
+        self._hide_hint()
\ No newline at end of file
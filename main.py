@@ -1,16 +1,24 @@
 # main.py
 import pygame
-import cv2
 import os
+import time
+import argparse
+import multiprocessing
 from settings import (
-    WIDTH, HEIGHT, FPS, GAME_DURATION, WIN_SCORE,
+    WIDTH, HEIGHT, FPS, GAME_DURATION, WIN_SCORE, CAMERA_INDICES, CAMERA_REGIONS,
+    HAND_INFERENCE_MODE,
+    MAX_FRAME_TIME, LANDMARK_PREDICTION, PREDICTION_MAX_EXTRAPOLATION,
+    LANDMARK_FILTER_ENABLED, FILTER_MIN_CUTOFF, FILTER_BETA, FILTER_D_CUTOFF,
+    PROFILER_ENABLED, PROFILER_WINDOW, PROFILER_EXPORT_PATH,
     BASKET_X, BASKET_Y, BASKET_WIDTH, BASKET_HEIGHT,
     POWERUP_SPAWN_CHANCE, NEGATIVE_BALL_CHANCE, NEGATIVE_BALL_PENALTY,
     NEGATIVE_BALL_COLOR, NEGATIVE_BALL_SYMBOL
 )
 from core import (
     HandModel, HandStyle, HandTracker, PhysicsManager, GameRenderer,
-    ComboSystem, PowerUpSystem, ParticleSystem, TutorialSystem
+    ComboSystem, PowerUpSystem, ParticleSystem, TutorialSystem, CaptureWorker,
+    ProcessHandSource, LandmarkPredictor, OneEuroFilter, LandmarkRecorder,
+    TraceReplaySource, FrameProfiler, GameClock, EventScheduler, MultiCameraSource, split_regions
 )
 
 # Game States
@@ -23,35 +31,84 @@ STATE_WIN = 4  # Thêm trạng thái THẮNG
 HIGHSCORE_FILE = "highscores.txt"
 
 class ShadowGame:
-    def __init__(self):
+    def __init__(self, headless=False, hand_source=None, record_path=None,
+                 profile=PROFILER_ENABLED, profile_path=PROFILER_EXPORT_PATH, party=False):
+        """
+        headless: không cần màn hình (SDL dummy) - dùng cho CI/benchmark.
+        hand_source: nguồn landmarks thay cho webcam (VD: FakeLandmarkSource, TraceReplaySource).
+        record_path: ghi landmarks của từng khung camera ra file trace để phát lại sau.
+        profile: đo thời gian từng công đoạn (F3 bật/tắt overlay); xuất ra profile_path khi thoát.
+        party: chế độ tiệc - hàng trăm bóng cùng lúc, chơi đến hết giờ (không có màn THẮNG).
+        """
+        self.headless = headless
+        self.party = party
+        if headless:
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
         pygame.init()
         
-        # Fullscreen & Scaled
-        flags = pygame.FULLSCREEN | pygame.SCALED
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT), flags, vsync=1)
+        if headless:
+            self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        else:
+            # Fullscreen & Scaled
+            flags = pygame.FULLSCREEN | pygame.SCALED
+            self.screen = pygame.display.set_mode((WIDTH, HEIGHT), flags, vsync=1)
         pygame.display.set_caption("Bàn Tay Ma Thuật")
         pygame.mouse.set_visible(True)
 
         self.clock = pygame.time.Clock()
         self.running = True
+        self.frame_dt = 1 / FPS  # Thời gian thật của khung trước (giây)
+        
+        # Profiler theo công đoạn (tắt = gần như không tốn gì)
+        self.profiler = FrameProfiler(enabled=profile, window=PROFILER_WINDOW)
+        self.profile_path = profile_path
 
-        # Core Systems
-        self.tracker = HandTracker()
-        self.physics = PhysicsManager()
+        # Core Systems (combo, power-up và spawn dùng chung đồng hồ game)
+        self.game_clock = GameClock()
+        self.scheduler = EventScheduler(self.game_clock)  # Spawn bóng, hết hạn power-up, ẩn hint
+        self.physics = PhysicsManager(self.game_clock, self.scheduler, party_mode=party)
         self.renderer = GameRenderer(self.screen)
-        self.combo_system = ComboSystem()
-        self.powerup_system = PowerUpSystem()
+        self.combo_system = ComboSystem(self.game_clock)
+        self.powerup_system = PowerUpSystem(self.game_clock, self.scheduler)
         self.particle_system = ParticleSystem()
-        self.tutorial_system = TutorialSystem()
+        self.tutorial_system = TutorialSystem(self.scheduler)
         
         self.particle_system.init_surface(WIDTH, HEIGHT)
         
-        # Webcam
-        self.cap = cv2.VideoCapture(0)
-        self.cap.set(3, WIDTH)
-        self.cap.set(4, HEIGHT)
+        # Webcam + nhận diện tay (mỗi camera một luồng nền hoặc tiến trình riêng)
+        if hand_source is not None:
+            self.hand_source = hand_source
+        elif len(CAMERA_INDICES) == 1:
+            self.hand_source = self._create_camera_source(CAMERA_INDICES[0])
+        else:
+            if CAMERA_REGIONS:
+                regions = [(round(x * WIDTH), round(y * HEIGHT), round(w * WIDTH), round(h * HEIGHT))
+                           for x, y, w, h in CAMERA_REGIONS]
+            else:
+                regions = split_regions(len(CAMERA_INDICES), WIDTH, HEIGHT)
+            sources = [self._create_camera_source(index) for index in CAMERA_INDICES]
+            self.hand_source = MultiCameraSource(sources, regions)
+        self.hand_source.start()
+        # Mỗi camera lọc rung + dự đoán riêng theo timestamp của chính nó, rồi mới gộp
+        self.camera_sources = getattr(self.hand_source, 'sources', [self.hand_source])
+        self.landmark_filters = []  # Lọc rung landmarks (tùy chọn)
+        self.predictors = []        # Dự đoán vị trí tay giữa 2 khung camera
+        for source in self.camera_sources:
+            max_hands = getattr(source, 'max_hands', 2)
+            if LANDMARK_FILTER_ENABLED:
+                self.landmark_filters.append(OneEuroFilter(max_hands=max_hands, min_cutoff=FILTER_MIN_CUTOFF,
+                                                           beta=FILTER_BETA, d_cutoff=FILTER_D_CUTOFF))
+            self.predictors.append(LandmarkPredictor(max_hands=max_hands, mode=LANDMARK_PREDICTION,
+                                                     max_extrapolation=PREDICTION_MAX_EXTRAPOLATION))
+        self.last_frame_ids = [-1] * len(self.camera_sources)
+        self.time_func = time.perf_counter  # Đồng hồ của timestamp landmarks
+        
+        # Ghi trace landmarks (tùy chọn)
+        max_hands = getattr(self.hand_source, 'max_hands', 2)
+        self.recorder = LandmarkRecorder(record_path, max_hands) if record_path else None
 
         self.state = STATE_MENU
+        self.drawn_state = None  # Trạng thái của khung vừa vẽ (để biết khi nào vẽ lại toàn bộ)
         self.score = 0
         self.time_left = GAME_DURATION
         
@@ -99,6 +156,8 @@ class ShadowGame:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
+                elif event.key == pygame.K_F3:
+                    self.profiler.toggle_overlay()
 
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 # MENU
@@ -126,33 +185,35 @@ class ShadowGame:
                         self.start_game()
 
     def update(self):
-        success, frame = self.cap.read()
-        if success:
-            frame = cv2.flip(frame, 1)
-            self.tracker.process(frame)
-        hands_data = self.tracker.get_hand_landmarks(WIDTH, HEIGHT)
+        with self.profiler.span('landmarks'):
+            hands_data, now = self.update_landmarks()
         
         # Chỉ update logic game khi đang chơi
         if self.state == STATE_PLAYING:
-            dt = (1/FPS) * self.time_scale
+            # Máy chậm: chỉ tính phần thời gian vật lý mô phỏng được -> spawn, power-up,
+            # combo và đồng hồ đếm ngược không chạy trước vật lý
+            dt = self.physics.clamp_frame_time(self.frame_dt * self.time_scale)
+            self.game_clock.advance(dt)
             
-            self.tutorial_system.update(dt)
-            self.powerup_system.update()
+            # Chỉ chạy các sự kiện đã đến hạn (spawn, hết hạn power-up, ẩn hint)
+            self.scheduler.run_due()
             
             # Xử lý Powerup
             self.time_scale = 0.5 if self.powerup_system.has_powerup('slow_motion') else 1.0
             self.physics.set_magnet(self.powerup_system.has_powerup('magnet'))
             
-            self.physics.update_hand_physics(hands_data)
+            with self.profiler.span('physics.hands'):
+                self.physics.update_hand_physics(hands_data, now)
             
-            # Spawn bóng nếu không có bóng nào
-            if len(self.physics.get_all_balls()) == 0:
+            # Spawn bóng khi hết bóng (chế độ tiệc: khi sân chưa đầy)
+            if self.physics.needs_spawn():
                 self.physics.spawn_ball()
             
-            self.physics.step(dt)
+            with self.profiler.span('physics.step'):
+                self.physics.advance(dt)
             
-            # Kiểm tra trạng thái TẤT CẢ bóng
-            results = self.physics.check_balls_status()
+            # Sự kiện vào rổ / ra ngoài từ cảm biến vật lý
+            results = self.physics.pop_ball_events()
             
             for status, ball_type, powerup_type in results:
                 if status == 1:  # Vào rổ
@@ -216,10 +277,11 @@ class ShadowGame:
                 # Lấy bóng đầu tiên làm vị trí vệt sao
                 b_pos = (all_balls[0].body.position.x, all_balls[0].body.position.y)
             
-            self.particle_system.update(dt, b_pos)
+            with self.profiler.span('particles.update'):
+                self.particle_system.update(dt, b_pos)
             
             # Kiểm tra điều kiện THẮNG
-            if self.score >= WIN_SCORE:
+            if not self.party and self.score >= WIN_SCORE:
                 self.state = STATE_WIN
             
             # Kiểm tra hết thời gian (THUA)
@@ -229,22 +291,63 @@ class ShadowGame:
         
         # Ở các màn hình khác, vẫn update tay để làm nền
         else:
-            self.physics.update_hand_physics(hands_data)
+            with self.profiler.span('physics.hands'):
+                self.physics.update_hand_physics(hands_data, now)
                 
         return hands_data
 
+    def _create_camera_source(self, camera_index):
+        """Một camera + bộ nhận diện riêng, chụp ở WIDTH x HEIGHT (tọa độ tay theo pixel khung chụp)"""
+        if HAND_INFERENCE_MODE == 'process':
+            return ProcessHandSource(WIDTH, HEIGHT, camera_index, profiler=self.profiler)
+        return CaptureWorker(HandTracker(), WIDTH, HEIGHT, camera_index, profiler=self.profiler)
+
+    def update_landmarks(self):
+        """Lấy landmarks mới nhất, lọc rung và dự đoán tới thời điểm hiện tại"""
+        now = self.time_func()
+        single = len(self.camera_sources) == 1
+        updated = False
+        predicted = []
+        # Không chờ camera: lấy kết quả mới nhất từ luồng nền của từng camera
+        for i, source in enumerate(self.camera_sources):
+            result = source.get_latest()
+            if result.frame_id != self.last_frame_ids[i]:
+                hands = result.hands
+                if self.recorder and single:
+                    self.recorder.record(hands, result.timestamp)
+                if self.landmark_filters:
+                    hands = self.landmark_filters[i].filter(hands, result.timestamp)
+                self.predictors[i].push(hands, result.timestamp)
+                self.last_frame_ids[i] = result.frame_id
+                updated = True
+            # Ước lượng vị trí tay tại thời điểm hiện tại của khung
+            predicted.append(self.predictors[i].predict(now))
+
+        if single:
+            return predicted[0], now
+
+        hands = self.hand_source.merge(predicted)
+        # Nhiều camera: ghi vị trí đã ước lượng của mọi tay tại cùng thời điểm `now`
+        if self.recorder and updated:
+            self.recorder.record(hands, now)
+        return hands, now
+
     def draw(self, hands_data):
-        self.renderer.clear_screen()
-        m_pos = pygame.mouse.get_pos()
-        
-        # Vẽ rổ ở mọi nơi trừ menu
-        if self.state not in [STATE_MENU]:
-            self.renderer.draw_basket()
+        prof = self.profiler
+        with prof.span('draw.background'):
+            # Đổi trạng thái hoặc màn hình có lớp phủ -> vẽ lại toàn bộ
+            full_redraw = (self.state != self.drawn_state or
+                           self.state not in [STATE_MENU, STATE_PLAYING])
+            self.drawn_state = self.state
+            # Vẽ rổ ở mọi nơi trừ menu (rổ nằm sẵn trong lớp nền tĩnh)
+            self.renderer.clear_screen(full_redraw, with_basket=self.state not in [STATE_MENU])
+            m_pos = pygame.mouse.get_pos()
         
         # Vẽ tay (Luôn hiện để người chơi test tay)
-        for hp in hands_data:
-            self.renderer.draw_organic_hand(hp, HandModel, HandStyle.REALISTIC_SHADOW)
-        self.renderer.apply_shadow_effect()
+        with prof.span('draw.hands'):
+            for hp in hands_data:
+                self.renderer.draw_organic_hand(hp, HandModel, HandStyle.REALISTIC_SHADOW)
+            self.renderer.apply_shadow_effect()
 
         # --- VẼ GIAO DIỆN THEO TRẠNG THÁI ---
         if self.state == STATE_MENU:
@@ -271,14 +374,18 @@ class ShadowGame:
 
         elif self.state == STATE_PLAYING:
             # Vẽ TẤT CẢ bóng
-            for ball in self.physics.get_all_balls():
-                self.renderer.draw_ball(ball)
+            with prof.span('draw.balls'):
+                for ball in self.physics.get_all_balls():
+                    self.renderer.draw_ball(ball)
             
-            self.particle_system.draw(self.screen)
-            self.renderer.draw_hud(self.score, self.time_left, self.combo_system, self.powerup_system)
+            with prof.span('particles.draw'):
+                self.renderer.mark_dirty(self.particle_system.draw(self.screen))
             
-            if self.tutorial_system.should_show_hint():
-                self.renderer.draw_hint(self.tutorial_system.current_hint)
+            with prof.span('draw.hud'):
+                self.renderer.draw_hud(self.score, self.time_left, self.combo_system, self.powerup_system)
+                
+                if self.tutorial_system.should_show_hint():
+                    self.renderer.draw_hint(self.tutorial_system.current_hint)
 
         elif self.state == STATE_WIN:
             # Màn hình CHIẾN THẮNG
@@ -292,17 +399,88 @@ class ShadowGame:
             hov = self.btn_reset_rect.collidepoint(m_pos)
             self.renderer.draw_button("CHƠI LẠI", self.btn_reset_rect, (200, 100, 0), hov)
         
-        pygame.display.update()
+        self.renderer.mark_dirty(prof.draw_overlay(self.screen))
+        
+        with prof.span('display.update'):
+            self.renderer.present()
 
     def run(self):
+        prof = self.profiler
         while self.running:
-            self.handle_events()
-            hands_data = self.update()
-            self.draw(hands_data)
-            self.clock.tick(FPS)
-        self.cap.release()
+            with prof.span('frame'):
+                with prof.span('events'):
+                    self.handle_events()
+                with prof.span('update'):
+                    hands_data = self.update()
+                with prof.span('draw'):
+                    self.draw(hands_data)
+            with prof.span('tick.wait'):
+                self.frame_dt = min(self.clock.tick(FPS) / 1000.0, MAX_FRAME_TIME)
+        self.shutdown()
+
+    def shutdown(self):
+        """Dừng nguồn landmarks, đóng file trace, xuất profile và thoát pygame"""
+        self.hand_source.stop()
+        if self.recorder:
+            self.recorder.close()
+        if self.profiler.enabled and self.profile_path:
+            self.profiler.export(self.profile_path)
+        cache = self.renderer.text_cache
+        print(f"🔤 Cache chữ: {len(cache.surfaces)} surface, tỉ lệ trúng {cache.hit_rate:.1%}")
         pygame.quit()
 
+    def run_headless(self, num_frames, sim_dt=1 / FPS):
+        """
+        Chạy num_frames khung update/draw ở trạng thái PLAYING, không giới hạn FPS.
+        Mỗi khung mô phỏng đúng sim_dt giây (độc lập với thời gian thật).
+        Trả về danh sách thời gian xử lý từng khung (giây).
+        """
+        # Đồng hồ mô phỏng cho timestamp landmarks + dự đoán tay: vận tốc tay tính theo
+        # thời gian mô phỏng như khi chơi thật (nguồn giả/trace có time_func)
+        sim_clock = GameClock()
+        self.time_func = sim_clock.now
+        for source in self.camera_sources:
+            if hasattr(source, 'time_func'):
+                source.time_func = sim_clock.now
+                source.start()  # Tính lại mốc phát theo đồng hồ mới
+
+        self.tutorial_system.first_time = False
+        self.start_game()
+        self.frame_dt = sim_dt
+
+        frame_times = []
+        prof = self.profiler
+        for _ in range(num_frames):
+            start = time.perf_counter()
+            sim_clock.advance(sim_dt)
+            pygame.event.pump()
+            with prof.span('update'):
+                hands_data = self.update()
+            with prof.span('draw'):
+                self.draw(hands_data)
+            frame_times.append(time.perf_counter() - start)
+            prof.add('frame', frame_times[-1])
+            
+            # Thắng/thua -> chơi lại ngay để luôn đo trạng thái PLAYING
+            if self.state != STATE_PLAYING:
+                self.start_game()
+
+        self.shutdown()
+        return frame_times
+
 if __name__ == "__main__":
-    game = ShadowGame()
+    # Cần cho chế độ nhận diện ở tiến trình riêng khi đóng gói bằng PyInstaller
+    multiprocessing.freeze_support()
+
+    parser = argparse.ArgumentParser(description="Bàn Tay Ma Thuật")
+    parser.add_argument("--record", metavar="FILE", help="Ghi landmarks của camera ra file trace")
+    parser.add_argument("--replay", metavar="FILE", help="Phát lại file trace thay cho camera")
+    parser.add_argument("--profile", metavar="FILE", nargs="?", const=PROFILER_EXPORT_PATH,
+                        help="Bật profiler, xuất thống kê ra FILE (.csv hoặc .json) khi thoát")
+    parser.add_argument("--party", action="store_true", help="Chế độ tiệc: hàng trăm bóng cùng lúc")
+    args = parser.parse_args()
+
+    source = TraceReplaySource(args.replay) if args.replay else None
+    profile_kwargs = {'profile': True, 'profile_path': args.profile} if args.profile else {}
+    game = ShadowGame(hand_source=source, record_path=args.record, party=args.party, **profile_kwargs)
     game.run()
\ No newline at end of file
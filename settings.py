@@ -5,12 +5,82 @@ WIDTH = 1280
 HEIGHT = 720
 FPS = 60  # Giữ 60 FPS cho mượt
 
+# --- CAMERA ---
+CAMERA_INDEX = 0  # Webcam mặc định
+# Nhiều camera cho sân rộng: VD [0, 1] - mỗi camera có luồng/tiến trình nhận diện riêng
+CAMERA_INDICES = [CAMERA_INDEX]
+# Vùng sân của từng camera (x, y, w, h theo tỉ lệ 0..1); None = chia đều theo chiều ngang.
+# Mọi camera chụp ở WIDTH x HEIGHT; ảnh được phóng to (giữ tỉ lệ) vừa phủ kín vùng rồi
+# cắt lấy cửa sổ ở giữa - VD vùng 640x720 chỉ dùng dải 640 px giữa ảnh 1280x720
+CAMERA_REGIONS = None
+# 'thread': nhận diện tay ở luồng nền | 'process': tiến trình riêng (shared memory)
+HAND_INFERENCE_MODE = 'thread'
+HAND_PROCESS_START_TIMEOUT = 20.0  # Giây chờ tiến trình nhận diện tải xong MediaPipe
+
+# --- NHẬN DIỆN TAY (MEDIAPIPE) ---
+# Preset: model_complexity + ngưỡng tin cậy + độ phân giải nhận diện
+HAND_TRACKING_PRESET = 'quality'
+HAND_TRACKING_PRESETS = {
+    # Máy yếu: model nhẹ, ảnh nhỏ, chỉ nhận diện quanh tay.
+    # ROI nhận diện lại từng vùng cắt (static_image_mode) -> đo bằng
+    # benchmarks/bench_hand_tracking.py so với 'quality' trên máy thật trước khi dùng
+    'kiosk-lowend': {
+        'model_complexity': 0,
+        'min_detection_confidence': 0.5,
+        'min_tracking_confidence': 0.5,
+        'inference_width': 480,   # None = giữ nguyên độ phân giải camera
+        'use_roi': True
+    },
+    'balanced': {
+        'model_complexity': 1,
+        'min_detection_confidence': 0.6,
+        'min_tracking_confidence': 0.6,
+        'inference_width': 640,
+        'use_roi': True
+    },
+    # Như bản gốc: toàn khung, độ phân giải đầy đủ
+    'quality': {
+        'model_complexity': 1,
+        'min_detection_confidence': 0.7,
+        'min_tracking_confidence': 0.7,
+        'inference_width': None,
+        'use_roi': False
+    }
+}
+HAND_ROI_MARGIN = 0.35         # Lề quanh vùng bao tay (tỉ lệ theo cạnh lớn)
+HAND_ROI_MIN_SIZE = 0.4        # Cạnh ROI tối thiểu (tỉ lệ theo cạnh nhỏ của khung)
+HAND_ROI_REFRESH_FRAMES = 15   # Cứ 15 khung quét toàn khung 1 lần để bắt tay mới
+
+# Dự đoán vị trí tay giữa các khung camera: None | 'extrapolate' | 'interpolate'
+LANDMARK_PREDICTION = 'extrapolate'
+PREDICTION_MAX_EXTRAPOLATION = 0.05  # Ngoại suy tối đa 50ms sau khung camera cuối
+
+# Lọc rung landmarks (One Euro) trước khi đưa vào vật lý/vẽ
+LANDMARK_FILTER_ENABLED = True
+FILTER_MIN_CUTOFF = 1.5      # Hz - càng thấp càng mượt khi tay đứng yên
+FILTER_BETA = 0.01           # Tăng tần số cắt theo tốc độ tay (pixel/giây)
+FILTER_D_CUTOFF = 1.0        # Hz - lọc vận tốc
+
 # --- VẬT LÝ (TỐI ƯU) ---
 GRAVITY = 900
 BALL_RADIUS = 20
 BALL_ELASTICITY = 0.4
 BALL_FRICTION = 0.5
 PHYSICS_ITERATIONS = 10  # Giảm từ 10 xuống 5 để tăng hiệu suất
+PHYSICS_SUBSTEPS = 2     # Số bước vật lý cố định cho mỗi khung 1/FPS (giảm trên máy yếu)
+PHYSICS_MAX_STEPS_PER_FRAME = 8  # Chặn số bước mỗi khung (chống "spiral of death")
+MAX_FRAME_TIME = 0.1     # Khung lâu hơn 100ms (lag, kéo cửa sổ) được tính là 100ms
+PHYSICS_THREADS = 1      # >1: bộ giải đa luồng của pymunk (không hỗ trợ trên Windows)
+
+# --- PROFILER (ĐO HIỆU NĂNG) ---
+PROFILER_ENABLED = False          # Bật bằng tham số --profile
+PROFILER_WINDOW = 240             # Số mẫu gần nhất dùng để tính trung bình/percentile
+PROFILER_EXPORT_PATH = "profile.json"  # Xuất khi thoát (.json hoặc .csv)
+
+# --- VẼ THEO VÙNG THAY ĐỔI (DIRTY RECT) ---
+DIRTY_RECT_RENDERING = True      # Chỉ xóa/cập nhật vùng đã vẽ (menu + đang chơi)
+TEXT_CACHE_SIZE = 256            # Số surface chữ tối đa giữ trong cache (LRU)
+BALL_PULSE_PHASES = 16           # Số pha nhấp nháy dựng sẵn cho mỗi loại bóng
 
 # --- THÔNG SỐ VẼ TAY ---
 FINGER_THICKNESS = 40
@@ -55,6 +125,13 @@ MULTI_BALL_CHANCE = 0.6  # 60% cơ hội spawn nhiều bóng (TĂNG TỪ 0.4 →
 MAX_BALLS_AT_ONCE = 3    # Tối đa 3 bóng cùng lúc
 BALL_SPAWN_DELAY = 0.3   # Khoảng cách giữa các bóng (giây)
 
+# --- CHẾ ĐỘ TIỆC (HÀNG TRĂM BÓNG) - bật bằng tham số --party ---
+PARTY_MAX_BALLS = 300        # Số bóng tối đa trên sân
+PARTY_SPAWN_BURST = 20       # Số bóng mỗi đợt spawn
+PARTY_SPAWN_DELAY = 0.05     # Khoảng cách giữa các bóng trong một đợt (giây)
+PARTY_HASH_CELL_SIZE = 40    # Cỡ ô spatial hash (~ đường kính bóng)
+PARTY_HASH_COUNT = 4000      # Số ô hash (~10 lần số shape)
+
 # --- HIỆU ỨNG HẠT (PARTICLES) ---
 PARTICLE_COUNT = 30        # Số lượng hạt nổ ra
 PARTICLE_LIFETIME = 1.0    # Thời gian tồn tại của hạt (giây)
@@ -63,6 +140,8 @@ PARTICLE_SPEED_MAX = 300   # Tốc độ tối đa
 PARTICLE_SIZE_MIN = 3      # Kích thước hạt nhỏ nhất
 PARTICLE_SIZE_MAX = 8      # Kích thước hạt lớn nhất
 STAR_TRAIL_LENGTH = 15     # Độ dài đuôi sao chổi
+PARTICLE_CAPACITY = 2048    # Số hạt tối đa cùng lúc (pool cố định)
+PARTICLE_ALPHA_LEVELS = 32  # Số mức độ trong suốt của sprite hạt
 
 # --- BALL SKINS (Giữ nguyên nhưng chỉ dùng default) ---
 BALL_SKINS = {